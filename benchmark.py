@@ -0,0 +1,198 @@
+import os
+import sys
+import csv
+import glob
+import time
+import signal
+import argparse
+import resource
+import multiprocessing
+from model.memory import MEMORY_MODES, set_default_mode
+from search_algorithm.registry import ALGORITHMS, load_algorithm
+
+BASE_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
+LEVEL_DIRECTORIES = (os.path.join(BASE_DIRECTORY, "inputs"), os.path.join(BASE_DIRECTORY, "input_library"))
+
+COLUMNS = ["level", "algorithm", "push_level", "status", "steps", "cost", "nodes", "time_ms", "memory_mb", "memory_mode", "peak_rss_mb"]
+
+def find_levels(directories):
+    levels = []
+    for directory in directories:
+        levels.extend(sorted(glob.glob(os.path.join(directory, "input-*.txt"))))
+    return levels
+
+def solve(algorithm, level, push_level, memory_limit_mb, memory_mode, connection):
+    """Worker process: run one solver on one level and send back a result row."""
+    # Lead a process group of our own, so the solver's own worker processes (HDA*,
+    # Portfolio) can be killed along with this one
+    os.setpgrp()
+    if memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    set_default_mode(memory_mode)
+    # Solvers print progress; keep the table readable
+    sys.stdout = open(os.devnull, "w")
+
+    row = {"status": "error"}
+    try:
+        algorithm_class = load_algorithm(algorithm)
+        solver = algorithm_class(level, push_level=push_level)
+        solver.run()
+        result = solver.get_result()
+        row = {
+            "status": result.get_status(),  # solved, stopped early, unsolvable, budget exceeded or cancelled
+            "steps": result.get_steps(),
+            "cost": result.get_total_cost(),
+            "nodes": result.get_node(),
+            "time_ms": round(result.get_time(), 2),
+            "memory_mb": round(result.get_memory(), 2),
+            "memory_mode": result.get_memory_mode(),
+            "sequence": result.get_sequence_of_actions(),
+        }
+    except MemoryError:
+        row = {"status": "memory"}
+    except Exception as e:
+        row = {"status": f"error: {e!r}"}
+    row["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2)
+    connection.send(row)
+    connection.close()
+
+def receive_row(receiver):
+    """The row a worker sent, or None if it hasn't sent one (yet, or before exiting)."""
+    try:
+        return receiver.recv() if receiver.poll() else None
+    except EOFError:
+        return None
+
+def kill_group(process):
+    """Kill a run together with any worker processes it started (see solve())."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        # Not leading its group yet, or the whole group is gone already
+        if process.is_alive():
+            process.kill()
+
+def run_benchmark(levels, algorithms, push_level=False, workers=None, time_limit=60, memory_limit_mb=None, memory_mode="off", on_row=None):
+    """
+    Solve every level with every algorithm, up to `workers` runs at a time.
+
+    Each run gets its own process, so a run over time_limit seconds can be killed and
+    a run over memory_limit_mb fails with MemoryError without taking the others down.
+    memory_mode picks how the solvers measure memory (see MemoryTracker); peak_rss_mb
+    is always reported. Returns one row dict per run (see COLUMNS), in level then
+    algorithm order.
+    """
+    workers = workers or os.cpu_count()
+    jobs = [(level, algorithm) for level in levels for algorithm in algorithms]
+    rows = {}
+    running = []  # (job, process, connection, start_time)
+
+    try:
+        while jobs or running:
+            while jobs and len(running) < workers:
+                level, algorithm = jobs.pop(0)
+                receiver, sender = multiprocessing.Pipe(duplex=False)
+                process = multiprocessing.Process(target=solve, args=(algorithm, level, push_level, memory_limit_mb, memory_mode, sender), daemon=False)
+                process.start()
+                sender.close()
+                running.append(((level, algorithm), process, receiver, time.time()))
+
+            still_running = []
+            for job, process, receiver, start_time in running:
+                row = receive_row(receiver)
+                if row is not None:
+                    process.join()
+                elif not process.is_alive():
+                    kill_group(process)  # Its workers may have outlived it; before join() so the pid isn't reused
+                    process.join()
+                    # It may have sent its row and exited after the poll above; if not, it was
+                    # killed for going over the memory limit before it could report
+                    row = receive_row(receiver) or {"status": "memory" if memory_limit_mb else "crashed"}
+                elif time_limit is not None and time.time() - start_time > time_limit:
+                    kill_group(process)
+                    process.join()
+                    row = receive_row(receiver) or {"status": "timeout", "time_ms": round(time_limit * 1000, 2)}
+
+                if row is None:
+                    still_running.append((job, process, receiver, start_time))
+                    continue
+                receiver.close()
+                level, algorithm = job
+                row.update({"level": level, "algorithm": algorithm, "push_level": push_level})
+                rows[job] = row
+                if on_row is not None:
+                    on_row(row)
+            running = still_running
+            if running:
+                time.sleep(0.01)
+    finally:
+        # Runs lead their own process groups, so a Ctrl-C here doesn't reach them
+        for _, process, _, _ in running:
+            kill_group(process)
+
+    return [rows[(level, algorithm)] for level in levels for algorithm in algorithms]
+
+def write_table(rows, output_path):
+    """Write the rows as CSV, or as tab-separated text if the path ends in .tsv."""
+    directory = os.path.dirname(output_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    delimiter = "\t" if output_path.endswith(".tsv") else ","
+    with open(output_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS, delimiter=delimiter, restval="", extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+def save_to_store(rows, store_path):
+    """Upsert solved rows into a ResultsStore, keyed by level path and algorithm."""
+    from model.result import Result
+    from model.results_store import ResultsStore
+    with ResultsStore(store_path) as store:
+        for row in rows:
+            if row["status"] != "solved":
+                continue
+            result = Result(row["algorithm"], row["steps"], row["cost"], row["nodes"], row["time_ms"], row["memory_mb"], row.get("sequence", ""))
+            store.save(row["level"], result)
+
+def print_row(row):
+    print("{level:32} {algorithm:14} {status:10} steps={steps:<6} cost={cost:<7} nodes={nodes:<9} time={time_ms} ms".format(
+        **{column: row.get(column, "-") for column in COLUMNS}), flush=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve every level with the selected algorithms, without the GUI.")
+    parser.add_argument("-a", "--algorithms", default="BFS,DFS,UCS,A*",
+                        help=f"comma-separated list from: {', '.join(ALGORITHMS)} (default: BFS,DFS,UCS,A*)")
+    parser.add_argument("-l", "--levels", nargs="*",
+                        help="level files to run (default: every input-*.txt in inputs/ and input_library/)")
+    parser.add_argument("-p", "--push-level", action="store_true", help="run the solvers in push-level mode")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="parallel runs (default: CPU count)")
+    parser.add_argument("-t", "--time-limit", type=float, default=60, help="seconds per run (default: 60)")
+    parser.add_argument("-m", "--memory-limit", type=int, default=None, help="MB of address space per run")
+    parser.add_argument("--memory", choices=MEMORY_MODES, default="off",
+                        help="how solvers measure memory: off (default, fastest), rss or tracemalloc")
+    parser.add_argument("-s", "--store", default=None,
+                        help="also upsert solved runs into this SQLite results store (see model/results_store.py)")
+    parser.add_argument("-o", "--output", default=os.path.join("outputs", "benchmark.csv"),
+                        help="results table, .csv or .tsv (default: outputs/benchmark.csv)")
+    args = parser.parse_args(argv)
+
+    algorithms = [name.strip() for name in args.algorithms.split(",") if name.strip()]
+    unknown = [name for name in algorithms if name not in ALGORITHMS]
+    if unknown:
+        parser.error(f"unknown algorithm(s): {', '.join(unknown)}")
+
+    levels = args.levels or find_levels(LEVEL_DIRECTORIES)
+    if not levels:
+        parser.error("no level files found")
+
+    rows = run_benchmark(levels, algorithms, push_level=args.push_level, workers=args.workers,
+                         time_limit=args.time_limit, memory_limit_mb=args.memory_limit,
+                         memory_mode=args.memory, on_row=print_row)
+    write_table(rows, args.output)
+    if args.store:
+        save_to_store(rows, args.store)
+    print(f"Wrote {len(rows)} results to {args.output}")
+
+if __name__ == "__main__":
+    main()
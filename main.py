@@ -2,10 +2,13 @@ import sys
 import os
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QHBoxLayout, QVBoxLayout, QComboBox, 
-    QPushButton, QLabel, QDialog, QProgressBar
+    QPushButton, QLabel, QDialog, QProgressBar, QCheckBox
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from model.maze import Maze
+from model.level import load_level
+from model.solution_cache import SolutionCache
+from model.memory import get_default_mode, set_default_mode
 from gui.view import MazeView
 from controller.controller import MazeController
 import re
@@ -14,32 +17,69 @@ from search_algorithm.bfs import BFS
 from search_algorithm.dfs_3 import DFS
 from search_algorithm.ucs_new import UCS
 from search_algorithm.a_star import A_star
+from search_algorithm.ida_star import IDA_star
+from search_algorithm.bidirectional import Bidirectional
+from search_algorithm.ara_star import ARA_star
+from search_algorithm.portfolio import Portfolio
+from search_algorithm.hda_star import HDA_star
+from search_algorithm.budget import SearchBudget, CancellationToken, SOLVED, UNSOLVABLE, STOPPED_EARLY
 
 class SolverThread(QThread):
     finished = pyqtSignal(object)
+    progress = pyqtSignal(object)  # SearchProgress samples while the solver runs
     
-    def __init__(self, algorithm_class, file_path):
+    def __init__(self, algorithm_name, algorithm_class, file_path, push_level=False):
         super().__init__()
+        self.algorithm_name = algorithm_name  # registry name, shared with solve.py's cache entries
         self.algorithm_class = algorithm_class
         self.file_path = file_path
+        self.push_level = push_level
+        self.cancellation = CancellationToken()
+
+    def cancel(self):
+        """Ask the solver to stop; it finishes with a "cancelled" result."""
+        self.cancellation.cancel()
 
     def run(self):
-        algorithm_instance = self.algorithm_class(self.file_path)
-        algorithm_instance.run()
-        result = algorithm_instance.get_result()
+        # Re-running a solver on an unchanged level is answered from the solution cache
+        options = {'push_level': self.push_level, 'memory_mode': get_default_mode()}
+        cache = SolutionCache()
+        result = cache.load(self.file_path, self.algorithm_name, options)
+        if result is None:
+            algorithm_instance = self.algorithm_class(self.file_path, push_level=self.push_level,
+                                                      budget=SearchBudget(cancellation=self.cancellation,
+                                                                          on_progress=self.progress.emit))
+            algorithm_instance.run()
+            result = algorithm_instance.get_result()
+            cache.store(self.file_path, self.algorithm_name, options, result)
         self.finished.emit(result)
 
 class RunningDialog(QDialog):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, on_cancel=None):
         super().__init__(parent)
         self.setWindowTitle("Solver Running")
         self.setModal(True)
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowType.WindowCloseButtonHint)
+        self.on_cancel = on_cancel
         layout = QVBoxLayout()
-        label = QLabel("Solver is running. Please wait...")
-        layout.addWidget(label)
+        self.label = QLabel("Solver is running. Please wait...")
+        layout.addWidget(self.label)
+        self.progress_label = QLabel("")
+        layout.addWidget(self.progress_label)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel)
+        layout.addWidget(self.cancel_button)
         self.setLayout(layout)
 
+    def show_progress(self, progress):
+        self.progress_label.setText(str(progress).replace(", ", "\n"))
+
+    def cancel(self):
+        self.label.setText("Stopping the solver...")
+        self.cancel_button.setEnabled(False)
+        if self.on_cancel:
+            self.on_cancel()
+
 class MainWindow(QWidget):
     def __init__(self):
         super().__init__()
@@ -55,9 +95,12 @@ class MainWindow(QWidget):
         self.top_layout.addWidget(self.file_selector)
 
         self.algorithm_selector = QComboBox()
-        self.algorithm_selector.addItems(["BFS", "DFS", "UCS", "A*"])
+        self.algorithm_selector.addItems(["BFS", "DFS", "UCS", "A*", "IDA*", "ARA*", "HDA*", "Bidirectional", "Portfolio"])
         self.top_layout.addWidget(self.algorithm_selector)
 
+        self.push_level_checkbox = QCheckBox("Push-level search")
+        self.top_layout.addWidget(self.push_level_checkbox)
+
         self.layout.addLayout(self.top_layout)
 
         self.button_layout = QHBoxLayout()
@@ -110,18 +153,9 @@ class MainWindow(QWidget):
             return False 
 
         try:
-            with open(filepath, 'r') as f:
-                first_line = f.readline().strip().split()
-                list(map(int, first_line))  
-
-                valid_chars = {"#", " ", "$", "@", ".", "*", "+"}
-                for line in f:
-                    line = line.rstrip('\n')
-                    if not all(char in valid_chars for char in line):
-                        return False 
-                        
-            return True  
-        except (ValueError, FileNotFoundError):
+            load_level(filepath)  # Parsed once; the solvers reuse the cached level
+            return True
+        except (ValueError, OSError):
             return False 
 
     def load_maze_from_selected_file(self, filename):
@@ -156,27 +190,44 @@ class MainWindow(QWidget):
                 "BFS": BFS,
                 "DFS": DFS,
                 "UCS": UCS,
-                "A*": A_star
+                "A*": A_star,
+                "IDA*": IDA_star,
+                "ARA*": ARA_star,
+                "HDA*": HDA_star,
+                "Bidirectional": Bidirectional,
+                "Portfolio": Portfolio
             }
 
             if algorithm_name in algorithms:
                 algorithm_class = algorithms[algorithm_name]
                 
-                self.dialog = RunningDialog(self)
+                self.thread = SolverThread(algorithm_name, algorithm_class, file_path, self.push_level_checkbox.isChecked())
+                self.dialog = RunningDialog(self, on_cancel=self.thread.cancel)
+                self.thread.progress.connect(self.dialog.show_progress)
                 self.dialog.show()
 
-                self.thread = SolverThread(algorithm_class, file_path)
                 self.thread.finished.connect(self.on_solver_finished)
                 self.thread.start()
 
                 self.start_button.setEnabled(False)
 
     def on_solver_finished(self, result):
+        if result.get_status() not in (SOLVED, UNSOLVABLE, STOPPED_EARLY):
+            # Cancelled or out of budget: nothing to save or animate
+            self.dialog.close()
+            self.thread = None
+            self.custom_text.setText(f"Search {result.get_status()} after {result.get_node()} nodes")
+            self.start_button.setEnabled(True)
+            return
+
         input_filename = os.path.basename(os.path.join(os.path.dirname(os.path.realpath(__file__)), 'inputs', self.file_selector.currentText()))
         output_filename = input_filename.replace('input', 'output')
         output_path = os.path.join('outputs', output_filename)
 
-        result.save(output_path, duplicate=True)
+        # A stopped-early solution is still animated, but not saved over a finished one,
+        # and a cached one was saved when it was found
+        if result.get_status() != STOPPED_EARLY and not result.get_from_cache():
+            result.save(output_path, duplicate=True)
 
         if self.controller:
             self.controller.stop()
@@ -198,6 +249,8 @@ class MainWindow(QWidget):
         self.controller = None
 
     def reset_simulation(self):
+        if self.thread:
+            self.thread.cancel()
         if self.controller:
             self.controller.stop()
             self.controller = None
@@ -225,6 +278,8 @@ class MainWindow(QWidget):
                 print(f"Error deleting {file_path}: {e}")
 
 if __name__ == "__main__":
+    # The output files report memory, so the GUI measures it exactly
+    set_default_mode("tracemalloc")
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -0,0 +1,94 @@
+import numpy as np
+from search_algorithm.push_distance import UNREACHABLE
+
+DIRECTIONS = ((0, -1), (-1, 0), (0, 1), (1, 0))
+
+def shifted(mask, dx, dy, fill=False):
+    """
+    out[..., y, x] = mask[..., y - dy, x - dx], with fill where that falls outside the
+    grid. Leading axes (e.g. one layer per switch) are shifted alike.
+    """
+    height, width = mask.shape[-2:]
+    out = np.full_like(mask, fill)
+    out[..., max(dy, 0):height + min(dy, 0), max(dx, 0):width + min(dx, 0)] = \
+        mask[..., max(-dy, 0):height + min(-dy, 0), max(-dx, 0):width + min(-dx, 0)]
+    return out
+
+class LevelGrid:
+    """
+    NumPy view of a level's static grid, for per-level preprocessing.
+
+    Built from the solvers' maze rows ('#', '.' and ' '), indexed [y, x]:
+    - walls, floor: boolean masks (cells outside the rows count as walls)
+
+    The analyses work on whole masks at once instead of cell by cell: a flood fill
+    or breadth-first search advances one layer per step by shifting the frontier in
+    the four directions, so a 100x100 map costs a few hundred array operations rather
+    than a Python loop per cell. Results are masks or arrays indexed [y, x]; their
+    row-major bytes match the flat y * width + x tables the solvers look up.
+
+    Importing NumPy costs more than the whole analysis of a small level, so the tables
+    only use this class for levels where uses_level_grid() (model.level) is true.
+    """
+
+    def __init__(self, maze):
+        self.height = len(maze)
+        self.width = max((len(row) for row in maze), default=0)
+        cells = np.full((self.height, self.width), ord('#'), dtype=np.uint8)
+        for y, row in enumerate(maze):
+            cells[y, :len(row)] = np.frombuffer(''.join(row).encode('ascii'), dtype=np.uint8)
+
+        self.walls = cells == ord('#')
+        self.floor = ~self.walls
+
+        # pullable[d][y, x]: a stone on (x, y) can be pulled one cell against direction d,
+        # i.e. the cell and the one after it in direction d are both floor
+        self.pullable = [self.floor & shifted(self.floor, -dx, -dy) for dx, dy in DIRECTIONS]
+
+    def mask_of(self, positions):
+        mask = np.zeros((self.height, self.width), dtype=bool)
+        for x, y in positions:
+            mask[y, x] = True
+        return mask
+
+    def reachable_mask(self, starts):
+        """Floor cells connected to any of the start cells."""
+        reached = self.mask_of(starts) & self.floor
+        frontier = reached
+        while frontier.any():
+            grown = np.zeros_like(frontier)
+            for dx, dy in DIRECTIONS:
+                grown |= shifted(frontier, dx, dy)
+            frontier = grown & self.floor & ~reached
+            reached |= frontier
+        return reached
+
+    def pull_distances(self, sources):
+        """
+        Minimal pushes to bring a lone stone from every cell onto any of the sources,
+        found by pulling it backwards from them (UNREACHABLE where it can't be done).
+        Walls are respected and other stones ignored.
+        """
+        return self.pull_distances_each([sources])[0]
+
+    def pull_distances_each(self, source_groups):
+        """
+        pull_distances() for several groups of sources at once, stacked along the first
+        axis; the searches share every array operation, so one layer per step covers
+        all of them.
+        """
+        distances = np.full((len(source_groups), self.height, self.width), UNREACHABLE, dtype=np.uint16)
+        if not source_groups:
+            return distances
+        frontier = np.stack([self.mask_of(sources) for sources in source_groups]) & self.floor
+        reached = frontier.copy()
+        distance = 0
+        while frontier.any():
+            distances[frontier] = distance
+            pulled = np.zeros_like(frontier)
+            for (dx, dy), pullable in zip(DIRECTIONS, self.pullable):
+                pulled |= shifted(frontier, dx, dy) & pullable
+            frontier = pulled & ~reached
+            reached |= frontier
+            distance += 1
+        return distances
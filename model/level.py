@@ -0,0 +1,168 @@
+import os
+
+VALID_CHARACTERS = frozenset("# $@.*+")
+
+class Level:
+    """
+    A parsed level, shared by the solvers and the GUI.
+
+    Positions are (x, y). The level holds:
+    - rows: the padded text rows as they appear in the file (for drawing)
+    - walls: a width * height bitmap, walls[y * width + x] == 1 for walls
+    - floor_cells / floor_index: every non-wall cell and its index in that tuple
+    - ares, stones, stone_weights, switches: the start position
+    - maze: rows of '#', '.' and ' ', the static grid the solvers index as maze[y][x]
+
+    Every field is a tuple, bytes or dict that is never written after parsing, so one
+    Level can be handed to any number of solvers. Per-level tables that are expensive to
+    build (dead squares, push distances, ...) can be attached with precomputed() and are
+    then built only once per level.
+    """
+
+    __slots__ = ("width", "height", "rows", "walls", "floor_cells", "floor_index",
+                 "ares", "stones", "stone_weights", "switches", "maze", "_precomputed")
+
+    def __init__(self, text):
+        lines = text.split('\n')
+        if lines and lines[-1] == '':
+            lines.pop()  # Trailing newline
+        if not lines:
+            raise ValueError("Input file is empty.")
+
+        try:
+            stone_weights = tuple(map(int, lines[0].split()))
+        except ValueError:
+            raise ValueError("The first line must list the stone weights.")
+
+        raw_rows = [line.rstrip('\r') for line in lines[1:]]
+        width = max((len(row) for row in raw_rows), default=0)
+        rows = tuple(row.ljust(width) for row in raw_rows)
+
+        ares_position = None
+        stone_positions = []
+        switch_positions = []
+        maze = []
+        for y, row in enumerate(rows):
+            maze_row = []
+            for x, char in enumerate(row):
+                if char not in VALID_CHARACTERS:
+                    raise ValueError(f"Invalid character {char!r} at row {y + 1}, column {x + 1}.")
+                if char in '@+':
+                    ares_position = (x, y)
+                if char in '$*':
+                    stone_positions.append((x, y))
+                if char in '.*+':
+                    switch_positions.append((x, y))
+                maze_row.append('#' if char == '#' else '.' if char in '.*+' else ' ')
+            maze.append(tuple(maze_row))
+
+        # Ensure the number of weights matches the number of stones
+        if len(stone_weights) != len(stone_positions):
+            raise ValueError("Number of stone weights does not match the number of stones.")
+
+        self.width = width
+        self.height = len(rows)
+        self.rows = rows
+        self.walls = bytes(char == '#' for row in rows for char in row)
+        self.floor_cells = tuple((x, y) for y, row in enumerate(rows) for x, char in enumerate(row) if char != '#')
+        self.floor_index = {cell: index for index, cell in enumerate(self.floor_cells)}
+        self.ares = ares_position
+        self.stones = tuple(stone_positions)
+        self.stone_weights = stone_weights
+        self.switches = tuple(switch_positions)
+        self.maze = tuple(maze)
+        self._precomputed = {}
+
+    def is_wall(self, position):
+        x, y = position
+        return not (0 <= x < self.width and 0 <= y < self.height) or self.walls[y * self.width + x] == 1
+
+    def start_state(self):
+        """The start state in the dict form the solvers use."""
+        return {
+            'ares': self.ares,
+            'stones': self.stones,
+            'stone_weights': self.stone_weights,
+            'switches': self.switches,
+            'maze': self.maze,
+            'cost': 0
+        }
+
+    def replay(self, actions):
+        """
+        Play a sequence of actions from the start and return the cost after each step.
+
+        Raises ValueError if a move is illegal (walking into a wall or a stone, pushing
+        into a wall or a stone, or an uppercase push with nothing to push) or if the
+        stones don't all end up on switches.
+        """
+        directions = {'u': (0, -1), 'l': (-1, 0), 'd': (0, 1), 'r': (1, 0)}
+        ares_x, ares_y = self.ares
+        stone_positions = list(self.stones)
+        total_cost = 0
+        cost_each_step = []
+
+        for step, action in enumerate(actions):
+            if action.lower() not in directions:
+                raise ValueError(f"Unknown action {action!r} at step {step + 1}.")
+            dx, dy = directions[action.lower()]
+            target = (ares_x + dx, ares_y + dy)
+            if self.is_wall(target):
+                raise ValueError(f"Step {step + 1} walks into a wall.")
+
+            if target in stone_positions:
+                if action.islower():
+                    raise ValueError(f"Step {step + 1} walks into a stone.")
+                new_stone_position = (target[0] + dx, target[1] + dy)
+                if self.is_wall(new_stone_position) or new_stone_position in stone_positions:
+                    raise ValueError(f"Step {step + 1} pushes a stone into an obstacle.")
+                stone_index = stone_positions.index(target)
+                stone_positions[stone_index] = new_stone_position
+                total_cost += 1 + self.stone_weights[stone_index]
+            else:
+                if action.isupper():
+                    raise ValueError(f"Step {step + 1} pushes nothing.")
+                total_cost += 1
+            ares_x, ares_y = target
+            cost_each_step.append(total_cost)
+
+        switches = set(self.switches)
+        if not all(stone in switches for stone in stone_positions):
+            raise ValueError("Not every stone ends on a switch.")
+        return cost_each_step or [0]
+
+    def precomputed(self, name, build):
+        """Return the table stored under name, calling build() the first time."""
+        if name not in self._precomputed:
+            self._precomputed[name] = build()
+        return self._precomputed[name]
+
+# Levels with at least this many cells build their static tables (dead squares, push
+# distances, reachable cells) with the NumPy LevelGrid in model/grid.py. Smaller ones
+# build them in plain Python, which is about as fast there and skips importing NumPy
+LEVEL_GRID_MIN_CELLS = 2500
+
+def uses_level_grid(maze):
+    """Whether the static tables of a maze are worth building with NumPy."""
+    return len(maze) * max((len(row) for row in maze), default=0) >= LEVEL_GRID_MIN_CELLS
+
+# realpath -> (mtime_ns, size, Level)
+_level_cache = {}
+
+def load_level(filepath):
+    """
+    Parse a level file, or return the cached Level if the file hasn't changed since it
+    was last parsed (same modification time and size).
+    """
+    if not filepath:
+        raise ValueError("No input file provided.")
+    path = os.path.realpath(filepath)
+    stat = os.stat(path)
+    cached = _level_cache.get(path)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    with open(path, "r") as f:
+        level = Level(f.read())
+    _level_cache[path] = (stat.st_mtime_ns, stat.st_size, level)
+    return level
@@ -1,3 +1,5 @@
+from model.level import load_level
+
 class Maze:
     def __init__(self, filepath):
         self.grid = []
@@ -6,26 +8,15 @@ class Maze:
         self.load_maze(filepath)
 
     def load_maze(self, filepath):
-        with open(filepath, 'r') as f:
-            weight_line = f.readline().strip()
-            self.stone_weights = list(map(int, weight_line.split()))
-            raw_grid = [line.rstrip('\n') for line in f]
-
-        # Determine the maximum line length
-        max_length = max(len(line) for line in raw_grid)
-
-        # Pad each line to ensure consistent length
-        self.grid = [list(line.ljust(max_length)) for line in raw_grid]
+        # The level is parsed once and shared with the solvers; the grid is copied since
+        # the controller rewrites it while replaying a solution
+        level = load_level(filepath)
+        self.stone_weights = list(level.stone_weights)
+        self.grid = [list(row) for row in level.rows]
 
-        weight_iter = iter(self.stone_weights)
-        for i, row in enumerate(self.grid):
-            for j, cell in enumerate(row):
-                if cell in {'$', '*'}:
-                    try:
-                        weight = next(weight_iter)
-                        self.stones[(i, j)] = weight
-                    except StopIteration:
-                        self.stones[(i, j)] = 100
+        # Stones are keyed by (row, column), like the grid
+        for (x, y), weight in zip(level.stones, level.stone_weights):
+            self.stones[(y, x)] = weight
 
     def get_start_position(self):
         for i, row in enumerate(self.grid):
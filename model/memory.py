@@ -1,20 +1,75 @@
-import tracemalloc
-import psutil
+import os
 import time
+import threading
+
+MEMORY_MODES = ("off", "rss", "tracemalloc")
+MEMORY_MODE_VARIABLE = "ARES_MEMORY_MODE"
+
+def get_default_mode():
+    """Mode used by MemoryTracker() when none is given; "off" unless set."""
+    mode = os.environ.get(MEMORY_MODE_VARIABLE, "off")
+    return mode if mode in MEMORY_MODES else "off"
+
+def set_default_mode(mode):
+    """Set the default mode; kept in the environment so worker processes inherit it."""
+    if mode not in MEMORY_MODES:
+        raise ValueError(f"Unknown memory mode: {mode}")
+    os.environ[MEMORY_MODE_VARIABLE] = mode
 
 class MemoryTracker:
-    def __init__(self):
-        # Initialize tracemalloc to start tracking memory allocations
-        tracemalloc.start()
-        self.process = psutil.Process()
+    """
+    Measures peak memory during a search, in one of three modes:
+
+    - "off": nothing is measured and the peak is reported as 0, so timings are not
+      inflated by the measurement
+    - "rss": a background thread samples the process' resident set size (psutil) every
+      sample_interval seconds; cheap, but includes the interpreter and can miss short peaks
+    - "tracemalloc": every Python allocation is traced; exact but slows the search down
+
+    The mode is kept in `mode` so solvers can record it with the result.
+    """
+
+    def __init__(self, mode=None, sample_interval=0.01):
+        self.mode = mode if mode is not None else get_default_mode()
+        if self.mode not in MEMORY_MODES:
+            raise ValueError(f"Unknown memory mode: {self.mode}")
+        self.process = None
+        self.peak_rss = 0
+        self.sampler = None
+        self.stopped = threading.Event()
+
+        if self.mode == "tracemalloc":
+            # tracemalloc and psutil are imported on first use, so importing a solver
+            # doesn't pay for instrumentation it may never run
+            import tracemalloc
+            self.tracemalloc = tracemalloc
+            # Initialize tracemalloc to start tracking memory allocations
+            tracemalloc.start()
+        elif self.mode == "rss":
+            self.sample_rss()
+            self.sampler = threading.Thread(target=self.sample_until_stopped, args=(sample_interval,), daemon=True)
+            self.sampler.start()
+
+    def get_process(self):
+        if self.process is None:
+            import psutil
+            self.process = psutil.Process()
+        return self.process
+
+    def sample_rss(self):
+        self.peak_rss = max(self.peak_rss, self.get_process().memory_info().rss)
+
+    def sample_until_stopped(self, sample_interval):
+        while not self.stopped.wait(sample_interval):
+            self.sample_rss()
 
     def take_snapshot(self):
-        """Take a snapshot of memory usage for detailed tracking."""
-        return tracemalloc.take_snapshot()
+        """Take a snapshot of memory usage for detailed tracking (tracemalloc mode only)."""
+        return self.tracemalloc.take_snapshot()
 
     def get_memory_usage(self):
         """Get the current memory usage of the process."""
-        memory_info = self.process.memory_info()
+        memory_info = self.get_process().memory_info()
         return {
             'rss': memory_info.rss / (1024 * 1024),      # Physical memory in MB
             'vms': memory_info.vms / (1024 * 1024),      # Virtual memory in MB
@@ -29,10 +84,21 @@ class MemoryTracker:
             print(stat)
 
     def peak_memory_usage(self):
-        """Retrieve the peak memory usage tracked by tracemalloc."""
-        peak = tracemalloc.get_traced_memory()[1]  # Get peak memory
+        """Peak memory in MB: traced allocations, sampled RSS, or 0 when off."""
+        if self.mode == "tracemalloc":
+            peak = self.tracemalloc.get_traced_memory()[1]  # Get peak memory
+        elif self.mode == "rss":
+            if not self.stopped.is_set():
+                self.sample_rss()
+            peak = self.peak_rss
+        else:
+            peak = 0
         return peak / (1024 * 1024)  # Convert to MB
 
     def stop_tracking(self):
-        """Stop tracemalloc and clear traces."""
-        tracemalloc.stop()
+        """Stop measuring (stops tracemalloc and clears traces, or the sampler thread)."""
+        if self.mode == "tracemalloc":
+            self.tracemalloc.stop()
+        elif self.sampler is not None:
+            self.stopped.set()
+            self.sampler.join()
@@ -1,5 +1,7 @@
 import os
 
+RESULTS_DATABASE = "results.sqlite3"
+
 class Result:
     def __init__(self, search_algo_name = "", steps = 0, cost = 0, node = 0, time = 0.00, memory = 0.00, sequence_of_actions = ""):
         self.search_algo_name = search_algo_name        # for example : BFS
@@ -10,6 +12,10 @@ class Result:
         self.memory = memory                            # unit : MB, for example : 12.56
         self.sequence_of_actions = sequence_of_actions  # for example : uLulDrrRRRRRRurD
         self.cost_steps = []                          # for example : [0, 3, 10, 15, 30, 32]
+        self.memory_mode = "off"                        # how memory was measured: off, rss or tracemalloc
+        self.status = ""                                # solved, stopped early, unsolvable, budget exceeded or cancelled
+        self.solved_by = ""                             # for a portfolio: the solver whose result this is, e.g. A*
+        self.from_cache = False                         # loaded from the SolutionCache; time and memory are from the original run
 
     def save(self, filepath="", duplicate=False):
         """
@@ -23,49 +29,35 @@ class Result:
         - filepath (str): The path to the output file.
         - duplicate (bool): If False, ensures that each algorithm appears only once by replacing existing entries.
                             If True, allows multiple entries for the same algorithm.
+
+        With duplicate=False the entries live in a ResultsStore (results.sqlite3 next to
+        the output file) and the file is re-exported from it, so a save doesn't depend on
+        the file's size and concurrent saves don't lose each other's entries.
         """
         # Ensure the directory exists
         directory = os.path.dirname(filepath)
         if directory and not os.path.exists(directory):
-            os.makedirs(directory)
-
-        # Initialize a list to hold all entries except the current algorithm's (if duplicate=False)
-        filtered_lines = []
-
-        # If the file exists and duplicate is False, filter out existing entries for the current algorithm
-        if os.path.exists(filepath) and not duplicate:
-            with open(filepath, 'r') as f:
-                lines = f.readlines()
-
-            # Process the file in chunks of 3 lines (name, details, sequence)
-            entries = [lines[i:i+3] for i in range(0, len(lines), 3)]
-            
-            # Debugging: Print number of entries before filtering
-            print(f"Total entries before filtering: {len(entries)}")
-
-            # Filter out entries where the first line matches the current algorithm name
-            filtered_entries = [entry for entry in entries if entry[0].strip() != self.search_algo_name]
-            
-            # Debugging: Print number of entries after filtering
-            print(f"Total entries after filtering: {len(filtered_entries)}")
-
-            # Flatten the list of filtered entries back into a single list of lines
-            filtered_lines = [line for entry in filtered_entries for line in entry]
-
-            # Write the filtered content back to the file
-            with open(filepath, 'w') as f:
-                f.writelines(filtered_lines)
-
-        # Append the new result
-        with open(filepath, 'a') as f:
-            f.write(self.search_algo_name + "\n")
-            f.write(f"Steps: {self.steps}, Cost: {self.cost}, Node: {self.node}, Time (ms): {self.time}, Memory (MB): {self.memory}\n")
-            f.write(self.sequence_of_actions + "\n")
-
-        # Debugging: Confirm save operation
-        action = "Appended" if duplicate else "Saved"
-        print(f"{action} entry for algorithm: {self.search_algo_name}")
-        
+            os.makedirs(directory, exist_ok=True)
+
+        if duplicate:
+            # Append the new result
+            with open(filepath, 'a') as f:
+                f.write(self.to_text())
+            return
+
+        from model.results_store import ResultsStore
+        with ResultsStore(os.path.join(directory, RESULTS_DATABASE)) as store:
+            level = os.path.basename(filepath)
+            if not store.has_level(level) and os.path.exists(filepath):
+                store.import_text(level, filepath)  # Keep entries written before the store existed
+            store.save(level, self)
+            store.export(level, filepath)
+
+    def to_text(self):
+        """The result as the three lines written to output files."""
+        return (f"{self.search_algo_name}\n"
+                f"Steps: {self.steps}, Cost: {self.cost}, Node: {self.node}, Time (ms): {self.time}, Memory (MB): {self.memory}\n"
+                f"{self.sequence_of_actions}\n")
 
     # all getters and setters
     def get_search_algo_name(self):
@@ -110,6 +102,30 @@ class Result:
     def set_memory(self, memory):
         self.memory = memory
 
+    def get_memory_mode(self):
+        return self.memory_mode
+
+    def set_memory_mode(self, memory_mode):
+        self.memory_mode = memory_mode
+
+    def get_status(self):
+        return self.status
+
+    def set_status(self, status):
+        self.status = status
+
+    def get_solved_by(self):
+        return self.solved_by
+
+    def set_solved_by(self, solved_by):
+        self.solved_by = solved_by
+
+    def get_from_cache(self):
+        return self.from_cache
+
+    def set_from_cache(self, from_cache):
+        self.from_cache = from_cache
+
     def get_sequence_of_actions(self):
         return self.sequence_of_actions
     
@@ -0,0 +1,105 @@
+import os
+import time
+import sqlite3
+from model.result import Result
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    level TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    steps INTEGER NOT NULL,
+    cost INTEGER NOT NULL,
+    node INTEGER NOT NULL,
+    time REAL NOT NULL,
+    memory REAL NOT NULL,
+    sequence_of_actions TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (level, algorithm)
+);
+CREATE INDEX IF NOT EXISTS results_by_algorithm ON results (algorithm);
+"""
+
+class ResultsStore:
+    """
+    SQLite store of the latest result per (level, algorithm).
+
+    Saving is an upsert, so it costs the same however many results are stored, and the
+    database runs in WAL mode with a busy timeout, so several processes (for example
+    benchmark workers) can save at the same time. `level` is any string naming the
+    level; Result.save uses the output file's name. export() writes a level's results
+    in the outputs/output-XX.txt text format.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def save(self, level, result):
+        """Insert the result, replacing the stored one for the same level and algorithm."""
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (level, algorithm) DO UPDATE SET steps = excluded.steps, cost = excluded.cost, "
+                "node = excluded.node, time = excluded.time, memory = excluded.memory, "
+                "sequence_of_actions = excluded.sequence_of_actions, recorded_at = excluded.recorded_at",
+                (level, result.get_search_algo_name(), result.get_steps(), result.get_total_cost(), result.get_node(),
+                 result.get_time(), result.get_memory(), result.get_sequence_of_actions(), time.time()))
+
+    def has_level(self, level):
+        return self.connection.execute("SELECT 1 FROM results WHERE level = ? LIMIT 1", (level,)).fetchone() is not None
+
+    def query(self, level=None, algorithm=None):
+        """Stored results, optionally filtered by level and/or algorithm, oldest first."""
+        conditions = []
+        parameters = []
+        if level is not None:
+            conditions.append("level = ?")
+            parameters.append(level)
+        if algorithm is not None:
+            conditions.append("algorithm = ?")
+            parameters.append(algorithm)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.connection.execute(
+            "SELECT algorithm, steps, cost, node, time, memory, sequence_of_actions FROM results"
+            f"{where} ORDER BY recorded_at, rowid", parameters)
+        return [Result(*row) for row in rows]
+
+    def import_text(self, level, filepath):
+        """Load a level's results from an existing output file (3 lines per result)."""
+        with open(filepath, "r") as f:
+            lines = [line.rstrip("\n") for line in f]
+        for i in range(0, len(lines) - 2, 3):
+            name, details, actions = lines[i:i + 3]
+            try:
+                fields = dict(part.split(": ", 1) for part in details.split(", "))
+                result = Result(name.strip(), int(fields["Steps"]), int(fields["Cost"]), int(fields["Node"]),
+                                float(fields["Time (ms)"]), float(fields["Memory (MB)"]), actions)
+            except (ValueError, KeyError):
+                continue  # Not a result entry
+            self.save(level, result)
+
+    def export(self, level, filepath):
+        """Write a level's results to filepath in the output-XX.txt format."""
+        directory = os.path.dirname(filepath)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        # Replace the file in one step, so concurrent readers never see half of it
+        temporary_path = f"{filepath}.{os.getpid()}.tmp"
+        with open(temporary_path, "w") as f:
+            for result in self.query(level=level):
+                f.write(result.to_text())
+        os.replace(temporary_path, filepath)
@@ -0,0 +1,129 @@
+import os
+import json
+import hashlib
+from model.result import Result
+from model.level import load_level
+from search_algorithm.budget import SOLVED
+
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "ares_adventure", "solutions")
+
+class SolutionCache:
+    """
+    On-disk cache of solved levels.
+
+    Entries are content addressed: the key is a SHA-256 of the level file's bytes, the
+    solver's name and its options, so editing a level or changing a solver option never
+    hits a stale entry, and renaming or copying a level file still does. Each entry is
+    a small JSON file holding the Result fields.
+
+    Loaded solutions are replayed against the level before they are returned, and an
+    entry that doesn't replay to the recorded cost is deleted. Hits refresh the entry's
+    modification time, and once the directory grows past max_bytes the least recently
+    used entries are evicted.
+    """
+
+    # Part of every key; bumped when older entries can't be trusted (version 1 could
+    # hold solutions of searches that were stopped early or pruned past the optimum)
+    VERSION = 2
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes=16 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key(self, level_path, algorithm, options=None):
+        digest = hashlib.sha256(b"v%d\0" % self.VERSION)
+        with open(level_path, "rb") as f:
+            digest.update(f.read())
+        digest.update(b"\0" + algorithm.encode())
+        digest.update(b"\0" + json.dumps(options or {}, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def load(self, level_path, algorithm, options=None):
+        """Return the cached Result for this level and solver, or None."""
+        path = self.entry_path(self.key(level_path, algorithm, options))
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            cost_steps = load_level(level_path).replay(entry["sequence_of_actions"])
+            if cost_steps[-1] != entry["cost"]:
+                raise ValueError("Cached cost doesn't match the replayed cost.")
+        except (KeyError, TypeError, ValueError):
+            self.remove(path)  # Corrupt or stale entry
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+
+        result = Result(search_algo_name=entry["search_algo_name"], steps=entry["steps"], cost=entry["cost"],
+                        node=entry["node"], time=entry["time"], memory=entry["memory"],
+                        sequence_of_actions=entry["sequence_of_actions"])
+        result.set_cost_steps(cost_steps)
+        result.set_memory_mode(entry.get("memory_mode", "tracemalloc"))
+        result.set_solved_by(entry.get("solved_by", ""))
+        result.set_from_cache(True)
+        result.set_status(SOLVED)
+        return result
+
+    def store(self, level_path, algorithm, options, result):
+        """
+        Cache a solved Result. Anything else is skipped: an unsolved search may just have
+        been cut short, and a stopped-early one may have a cheaper solution left to find.
+        """
+        if result.get_status() != SOLVED:
+            return
+        entry = {
+            "search_algo_name": result.get_search_algo_name(),
+            "steps": result.get_steps(),
+            "cost": result.get_total_cost(),
+            "node": result.get_node(),
+            "time": result.get_time(),
+            "memory": result.get_memory(),
+            "memory_mode": result.get_memory_mode(),
+            "solved_by": result.get_solved_by(),
+            "sequence_of_actions": result.get_sequence_of_actions(),
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.entry_path(self.key(level_path, algorithm, options))
+        # Write to a temporary file and rename, so readers never see half an entry
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(temporary_path, path)
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total_bytes = 0
+        with os.scandir(self.directory) as scan:
+            for item in scan:
+                if not item.name.endswith(".json"):
+                    continue
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, item.path))
+                total_bytes += stat.st_size
+
+        entries.sort()  # Oldest first
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            self.remove(path)
+            total_bytes -= size
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
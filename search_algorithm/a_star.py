@@ -1,96 +1,52 @@
 import time
 import heapq
 from model.result import Result
+from model.level import load_level
 from model.memory import MemoryTracker
+from search_algorithm.state_codec import StateCodec
+from search_algorithm.budget import SearchBudget, final_status
+from search_algorithm.cell_graph import CellGraph
+from search_algorithm.push_search import PushSearch
+from search_algorithm.node_store import NodeStore
+from search_algorithm.deadlock import DeadSquareTable, is_freeze_deadlock, find_pi_corral
+from search_algorithm.zobrist import ZobristHasher
+from search_algorithm.push_distance import PushDistanceTable
+from search_algorithm.heuristic import MatchingHeuristic
 
 class A_star:
-    def __init__(self, input_file = ""):
+    def __init__(self, input_file="", push_level=False, corral_pruning=False, budget=None):
         self.input_file = input_file
+        self.push_level = push_level  # expand whole pushes instead of single Ares steps
+        self.budget = budget or SearchBudget()  # node/time/memory limits and cancellation
+        self.corral_pruning = corral_pruning  # restrict push-level expansion to PI-corral pushes (not cost-optimal)
         self.result = Result(search_algo_name = "A*")
-        self.start_state = self.get_start_state(input_file)
-
-    def get_start_state(self, input_file=""):
-        if not input_file:
-            raise ValueError("No input file provided.")
-
-        with open(input_file, "r") as f:
-            lines = f.readlines()
-        
-        if not lines:
-            raise ValueError("Input file is empty.")
-
-        maze = []           # 2D list representing the maze
-        ares_position = None
-        stone_positions = []
-        stone_weights = []
-        switch_positions = []
-        max_length_row = 0
-
-        # Parse the file line by line
-        for i, line in enumerate(lines):
-            if i == 0:  # First line contains stone weights
-                stone_weights = list(map(int, line.strip().split()))
-                continue
-            
-            line = line.rstrip('\n')
-            row = []  # To store the current row of the maze
-            max_length_row = max(max_length_row, len(line))
-            
-            for j, char in enumerate(line):
-                if char == '@':     # Ares' position
-                    ares_position = (j, i - 1)
-                    row.append(' ') # Ares is movable -> free space
-                elif char == '*':   # Stone on a switch position
-                    stone_positions.append((j, i - 1))
-                    switch_positions.append((j, i - 1))
-                    row.append('.') 
-                elif char == '+':   # Ares on a switch position
-                    ares_position = (j, i - 1)
-                    switch_positions.append((j, i - 1))
-                    row.append('.')
-                elif char == '$':   # Stone position
-                    stone_positions.append((j, i - 1))
-                    row.append(' ') # Stones are considered as movable objects -> free space
-                elif char == '.':   # Switch position
-                    switch_positions.append((j, i - 1))
-                    row.append('.') 
-                elif char == '#':   # Wall
-                    row.append('#') 
-                else:
-                    row.append(' ') 
-            maze.append(row)        # Add the row to the maze
-
-        # Ensure the number of weights matches the number of stones
-        if len(stone_weights) != len(stone_positions):
-            raise ValueError("Number of stone weights does not match the number of stones.")
-        
-        # Pad rows to ensure consistent length
-        for row in maze:
-            if len(row) < max_length_row:
-                row.extend([' '] * (max_length_row - len(row)))
-
-        return {
-            'ares': ares_position,
-            'stones': tuple(stone_positions),
-            'stone_weights': tuple(stone_weights),
-            'switches': tuple(switch_positions),
-            'maze': tuple(maze),
-            'cost': 0
-        }
+        self.level = load_level(input_file)
+        self.start_state = self.level.start_state()
+        # Static tables are built once per level and shared by every solver run on it
+        self.codec = self.level.precomputed('codec', lambda: StateCodec(self.start_state['maze'], self.start_state['ares'], self.start_state['stones']))
+        self.graph = self.level.precomputed('cell_graph', lambda: CellGraph(self.codec.cells))
+        self.push_search = PushSearch(self.graph)
+        self.dead_squares = self.level.precomputed('dead_squares', lambda: DeadSquareTable(self.start_state['maze'], self.start_state['switches']))
+        # Stones keep their identity (weight), so each one gets its own Zobrist keys
+        self.zobrist = ZobristHasher(self.codec.cells, len(self.start_state['stones']), ordered_stones=True)
+        self.switch_set = frozenset(self.start_state['switches'])
+        self.push_distances = self.level.precomputed('push_distances', lambda: PushDistanceTable(self.start_state['maze'], self.start_state['switches']))
+        self.matching = MatchingHeuristic(self.push_distances, self.start_state['stone_weights'])
 
     def get_result(self):
         return self.result
     
     def heuristic(self, state):
         ares_position, stone_positions = state
-        stone_weights = self.start_state['stone_weights']
 
-        stone_to_switch_distance = sum(
-            min(abs(stone[0] - switch[0]) + abs(stone[1] - switch[1]) for switch in self.start_state['switches']) * stone_weights[i]
-            for i, stone in enumerate(stone_positions)
-        )
-        ares_to_stone_distance = min(abs(ares_position[0] - stone[0]) + abs(ares_position[1] - stone[1]) for stone in stone_positions)
-        return stone_to_switch_distance + ares_to_stone_distance
+        # Every stone matched to its own switch, using wall-aware push distances
+        stone_to_switch_cost = self.matching.estimate(stone_positions)
+        if stone_to_switch_cost == 0:
+            return 0
+
+        # Some stone still has to be pushed, so Ares has to walk up next to one first
+        ares_to_stone_distance = min(abs(ares_position[0] - stone[0]) + abs(ares_position[1] - stone[1]) for stone in stone_positions) - 1
+        return stone_to_switch_cost + ares_to_stone_distance
 
     def run(self):
         if self.start_state == -1:
@@ -99,54 +55,67 @@ class A_star:
         
         # Initialize memory tracker
         memory_tracker = MemoryTracker()
+        self.budget.start(stats=lambda: (len(frontier), frontier[0][0] if frontier else None))  # sampled for progress reports
+        stop_reason = None
 
         start_state = (self.start_state['ares'], tuple(self.start_state['stones']))
+        # States are keyed by their Zobrist hash; the frontier also carries the packed
+        # state and its stones-on-switch count so successors can be built incrementally
+        start_hash = self.zobrist.hash_state(start_state)
         frontier = []
-        heapq.heappush(frontier, (0, start_state))
+        heapq.heappush(frontier, (0, start_hash, self.codec.encode(start_state), self.count_on_switch(start_state)))
         visited = set()
-        parent_map = {start_state: None}
-        cost_so_far = {start_state: 0}
+        nodes = NodeStore(self.codec if self.push_level else None)
+        nodes.add_root(start_hash)
+        cost_so_far = {start_hash: 0}
         nodes_generated = 0
 
         while frontier:
-            _, current_state = heapq.heappop(frontier)
-            ares_position, stone_positions = current_state
+            _, current_hash, current_key, current_on_switch = heapq.heappop(frontier)
             nodes_generated += 1
-            if current_state in visited:
+            stop_reason = self.budget.check(nodes_generated)
+            if stop_reason is not None:
+                break
+            if current_hash in visited:
                 continue
-            visited.add(current_state)
+            visited.add(current_hash)
 
-            if all(stone in self.start_state['switches'] for stone in stone_positions):
-                path = self.reconstruct_path(current_state, parent_map)
+            if current_on_switch == len(self.start_state['stones']):
+                path = self.reconstruct_path(current_hash, nodes)
                 self.result.set_sequence_of_actions(path)
                 self.result.set_steps(len(path))
                 self.result.set_cost_steps(self.find_cost_each_step(path))
                 total_cost = self.result.get_cost_steps()[-1]
                 self.result.set_total_cost(total_cost)
                 break
-                
-            for neighbor_state, action, action_cost in self.get_neighbors(current_state):
-                new_cost = cost_so_far[current_state] + action_cost
-                if neighbor_state not in cost_so_far or new_cost < cost_so_far[neighbor_state]:
-                    cost_so_far[neighbor_state] = new_cost
+
+            current_state = self.codec.decode(current_key)
+            for neighbor_state, action, action_cost, neighbor_hash, neighbor_on_switch in self.get_neighbors(current_state, current_hash, current_on_switch):
+                new_cost = cost_so_far[current_hash] + action_cost
+                if neighbor_hash not in cost_so_far or new_cost < cost_so_far[neighbor_hash]:
+                    cost_so_far[neighbor_hash] = new_cost
                     priority = new_cost + self.heuristic(neighbor_state)
-                    heapq.heappush(frontier, (priority, neighbor_state))
-                    parent_map[neighbor_state] = (current_state, action)
+                    heapq.heappush(frontier, (priority, neighbor_hash, self.codec.encode(neighbor_state), neighbor_on_switch))
+                    nodes.set(neighbor_hash, current_hash, action)
                     
         end_time = time.time()
 
         # Display memory usage details
-        print("Memory usage at start:", memory_tracker.get_memory_usage())
-        print("Memory usage at end:", memory_tracker.get_memory_usage())
         print("Peak memory usage during execution:", memory_tracker.peak_memory_usage(), "MB")
 
         self.result.set_time((end_time - start_time) * 1000)
         self.result.set_memory(memory_tracker.peak_memory_usage())  # Convert to MB
+        self.result.set_memory_mode(memory_tracker.mode)
+        self.result.set_status(final_status(self.result, stop_reason))
         self.result.set_node(nodes_generated)
 
         # Stop memory tracking
         memory_tracker.stop_tracking()
 
+    def count_on_switch(self, state):
+        _, stone_positions = state
+        return sum(stone in self.switch_set for stone in stone_positions)
+
     def find_cost_each_step(self, path):
         total_cost = 0
         ares_position = self.start_state['ares']
@@ -186,97 +155,97 @@ class A_star:
         return cost_each_step
 
 
-    def get_neighbors(self, state):
+    def get_neighbors(self, state, state_hash, on_switch):
+        """
+        Successors of a state as (new_state, action, cost, new_hash, new_on_switch) tuples.
+
+        The Zobrist hash and the number of stones on switches are updated from the
+        parent's values for just the cells that changed.
+        """
+        if self.push_level:
+            return self.get_push_neighbors(state, state_hash, on_switch)
+
         neighbors = []
         ares_position, stone_positions = state
-        directions = {'u': (0, -1), 'l': (-1, 0), 'd': (0, 1), 'r': (1, 0)}
-        
-        for action, (dx, dy) in directions.items():
-            new_ares_position = (ares_position[0] + dx, ares_position[1] + dy)
+        ares_keys = self.zobrist.ares_keys
+        bits = self.graph.bits
+        occupied = self.graph.occupancy(stone_positions)  # Stone bitset, so free cells are one AND
+        for action, new_ares_position, new_stone_position in self.graph.moves[ares_position]:
             # Move Ares without pushing a stone
-            if self.is_valid_move(new_ares_position, stone_positions):
+            if not bits[new_ares_position] & occupied:
                 new_state = (new_ares_position, stone_positions)
-                neighbors.append((new_state, action, 1))  # Added cost of 1
-            # Check if the stone can be pushed
-            elif new_ares_position in stone_positions:
+                new_hash = state_hash ^ ares_keys[ares_position] ^ ares_keys[new_ares_position]
+                neighbors.append((new_state, action, 1, new_hash, on_switch))  # Added cost of 1
+            # Push the stone, unless a wall (None) or another stone is behind it
+            elif new_stone_position is not None and not bits[new_stone_position] & occupied:
                 stone_index = stone_positions.index(new_ares_position)
-                new_stone_position = (new_ares_position[0] + dx, new_ares_position[1] + dy)
+                new_stone_positions = list(stone_positions)
+                new_stone_positions[stone_index] = new_stone_position
+                
+                if self.is_deadlock(new_stone_positions, new_stone_position):
+                    continue
+
+                # Cost is 1 (move) + stone weight
+                stone_cost = 1 + self.start_state['stone_weights'][stone_index]
+                new_state = (new_ares_position, tuple(new_stone_positions))
+                stone_keys = self.zobrist.stone_keys[stone_index]
+                new_hash = (state_hash ^ ares_keys[ares_position] ^ ares_keys[new_ares_position]
+                            ^ stone_keys[new_ares_position] ^ stone_keys[new_stone_position])
+                new_on_switch = on_switch - (new_ares_position in self.switch_set) + (new_stone_position in self.switch_set)
+                neighbors.append((new_state, action.upper(), stone_cost, new_hash, new_on_switch))
 
-                if self.is_valid_move(new_stone_position, stone_positions):
-                    new_stone_positions = list(stone_positions)
-                    new_stone_positions[stone_index] = new_stone_position
-                    
-                    if self.is_deadlock(new_stone_positions):
-                        continue
+        return neighbors
+    
+    def get_push_neighbors(self, state, state_hash, on_switch):
+        neighbors = []
+        ares_position, stone_positions = state
+        ares_keys = self.zobrist.ares_keys
+        distances = self.push_search.reachable(ares_position, set(stone_positions))
+        pushes = self.push_search.get_pushes(state, distances)
+
+        # If Ares has walled off a PI-corral, only its boundary stones are worth pushing.
+        # This keeps every solvable level solvable but may skip the cheapest solution.
+        if self.corral_pruning:
+            corral_stones = find_pi_corral(self.start_state['maze'], self.dead_squares, stone_positions, distances)
+            if corral_stones is not None:
+                pushes = [push for push in pushes if push[0] in corral_stones]
+
+        for stone_index, action, new_stone_position, walk_distance in pushes:
+            if new_stone_position in stone_positions:  # get_pushes already left out walls
+                continue
+
+            new_stone_positions = list(stone_positions)
+            new_ares_position = new_stone_positions[stone_index]  # Ares steps into the stone's old cell
+            new_stone_positions[stone_index] = new_stone_position
+
+            if self.is_deadlock(new_stone_positions, new_stone_position):
+                continue
 
-                    # Cost is 1 (move) + stone weight
-                    stone_cost = 1 + self.start_state['stone_weights'][stone_index]
-                    new_state = (new_ares_position, tuple(new_stone_positions))
-                    neighbors.append((new_state, action.upper(), stone_cost))
+            # Each walking step costs 1, the push itself costs 1 + stone weight
+            stone_cost = walk_distance + 1 + self.start_state['stone_weights'][stone_index]
+            new_state = (new_ares_position, tuple(new_stone_positions))
+            stone_keys = self.zobrist.stone_keys[stone_index]
+            new_hash = (state_hash ^ ares_keys[ares_position] ^ ares_keys[new_ares_position]
+                        ^ stone_keys[new_ares_position] ^ stone_keys[new_stone_position])
+            new_on_switch = on_switch - (new_ares_position in self.switch_set) + (new_stone_position in self.switch_set)
+            # Remember which stone was pushed, so the walks can be filled in later
+            neighbors.append((new_state, (action, new_ares_position), stone_cost, new_hash, new_on_switch))
 
         return neighbors
-    
-    def is_valid_move(self, position, stone_positions_set):
-        x, y = position
-        if self.start_state['maze'][y][x] == '#': # Prevent moving into wall
-            return False
-        if position in stone_positions_set: # Prevent pushing a stone into another stone
-            return False
-        return True
-    
-    def is_deadlock(self, stone_positions):
-        stones_set = set(stone_positions) # convert to set for faster lookup, average time complexity O(1)
-        maze = self.start_state['maze']
-        for stone in stone_positions:
-            x, y = stone
-
-            if (maze[y][x] == '.'):  # Stone is in a switch position
-                return False
-            
-            if self.is_corner_deadlock(x, y, maze):
-                return True
-            
-            if self.is_wall_deadlock(x, y, maze, stones_set):
-                return True
-                
-        return False
-    
-    def is_corner_deadlock(self, x, y, maze):
-        """Check if stone is stuck in a corner formed by walls."""
-        corners = [
-            ((x-1, y), (x, y-1)),  # Top-left
-            ((x+1, y), (x, y-1)),  # Top-right
-            ((x-1, y), (x, y+1)),  # Bottom-left
-            ((x+1, y), (x, y+1))   # Bottom-right
-        ]
-        
-        for (x1, y1), (x2, y2) in corners:
-            if maze[y1][x1] == '#' and maze[y2][x2] == '#':
-                return True
-        return False
-
-    def is_wall_deadlock(self, x, y, maze, stones_set):
-        """Check if stone is stuck against a wall with no path to any switch."""
-        if maze[y][x-1] == '#' or maze[y][x+1] == '#':  # Horizontal wall
-            # Check if stone is blocked vertically by other stones 
-            above_blocked = (x, y-1) in stones_set and (maze[y-1][x-1] == '#' or maze[y-1][x+1] == '#')
-            below_blocked = (x, y+1) in stones_set and (maze[y+1][x-1] == '#' or maze[y+1][x+1] == '#')
-            if above_blocked or below_blocked:
-                return True
-
-        if maze[y-1][x] == '#' or maze[y+1][x] == '#':  # Vertical wall
-            # Check if stone is blocked horizontally by other stones
-            left_blocked = (x-1, y) in stones_set and (maze[y-1][x-1] == '#' or maze[y+1][x-1] == '#')
-            right_blocked = (x+1, y) in stones_set and (maze[y-1][x+1] == '#' or maze[y+1][x+1] == '#')
-            if left_blocked or right_blocked:
-                return True
-
-        return False
-
-    def reconstruct_path(self, state, parent_map):
-        path = []
-        current_state = state
-        while parent_map[current_state] is not None:
-            current_state, action = parent_map[current_state]
-            path.append(action)
-        return ''.join(path[::-1])
\ No newline at end of file
+
+    def is_deadlock(self, stone_positions, moved_stone):
+        """Check if the stone that was just pushed can no longer reach a switch."""
+        if self.dead_squares.is_dead(moved_stone): # Precomputed, covers corners and dead walls
+            return True
+
+        # The push may have frozen the stone, together with its neighbours, off the switches
+        stones_set = set(stone_positions)
+        return is_freeze_deadlock(self.start_state['maze'], self.dead_squares, stones_set, moved_stone)
+
+    def reconstruct_path(self, state_hash, nodes):
+        path = nodes.path(state_hash)
+        if self.push_level:
+            # Each action is a single (push, stone_position); fill in the walks between them
+            start_state = (self.start_state['ares'], self.start_state['stones'])
+            return self.push_search.expand_path(start_state, path)
+        return ''.join(path)
\ No newline at end of file
@@ -0,0 +1,181 @@
+import time
+import heapq
+from model.result import Result
+from model.memory import MemoryTracker
+from search_algorithm.a_star import A_star
+from search_algorithm.node_store import NodeStore
+from search_algorithm.budget import BUDGET_EXCEEDED, STOPPED_EARLY, final_status
+
+INFINITY = float('inf')
+
+class ARA_star(A_star):
+    """
+    Anytime repairing A* (ARA*).
+
+    The first search runs with f = g + weight * h for a large weight, which finds a
+    (possibly expensive) solution quickly. Every later search lowers the weight and
+    carries on from the previous one instead of starting over: the open list is re-keyed,
+    and states whose g improved after they were closed (the INCONS list) are put back on
+    it. Each better solution is stored in the result and passed to on_solution(result)
+    as soon as it is found.
+
+    The run ends when a search at weight 1 finishes, which proves the last solution
+    optimal for A_star's heuristic, or when time_limit seconds have passed, in which case
+    the best solution so far is kept with the status "stopped early". Move generation,
+    deadlock pruning and the heuristic are shared with A_star (corral_pruning gives up
+    the optimality proof, as it does there).
+    """
+
+    def __init__(self, input_file="", push_level=False, corral_pruning=False,
+                 initial_weight=3.0, weight_step=0.5, time_limit=None, on_solution=None, budget=None):
+        super().__init__(input_file, push_level=push_level, corral_pruning=corral_pruning, budget=budget)
+        self.result = Result(search_algo_name = "ARA*")
+        self.initial_weight = initial_weight
+        self.weight_step = weight_step
+        self.time_limit = time_limit    # seconds, None = run until optimal
+        self.on_solution = on_solution  # called with the result after every improvement
+        self.weight = initial_weight
+        self.suboptimality_bound = INFINITY  # cost of the last solution / optimal cost, at most
+
+    def run(self):
+        if self.start_state == -1:
+            return
+        start_time = time.time()
+        deadline = start_time + self.time_limit if self.time_limit is not None else None
+
+        # Initialize memory tracker
+        memory_tracker = MemoryTracker()
+        self.budget.start(stats=lambda: (len(frontier), frontier[0][0] if frontier else None))  # sampled for progress reports
+        self.stop_reason = None
+
+        start_state = (self.start_state['ares'], tuple(self.start_state['stones']))
+        start_hash = self.zobrist.hash_state(start_state)
+        goal_count = len(self.start_state['stones'])
+
+        # Search state shared by every iteration
+        self.cost_so_far = {start_hash: 0}
+        self.nodes = NodeStore(self.codec if self.push_level else None)
+        self.nodes.add_root(start_hash)
+        self.open_states = {start_hash: (self.codec.encode(start_state), self.count_on_switch(start_state))}
+        self.inconsistent = {}
+        self.closed = set()
+        self.best_goal_hash = None
+        self.best_cost = INFINITY
+        self.published_cost = None
+        self.nodes_generated = 0
+
+        if self.open_states[start_hash][1] == goal_count:
+            self.best_goal_hash, self.best_cost = start_hash, 0
+
+        self.weight = self.initial_weight
+        frontier = self.rebuild_frontier()
+        while True:
+            finished = self.improve_path(frontier, deadline, goal_count)
+            if self.best_goal_hash is not None:
+                self.publish(start_time, memory_tracker)
+                self.suboptimality_bound = min(self.weight, self.best_cost / max(self.lowest_f(), 1))
+            if not finished or self.weight <= 1:
+                break
+
+            # Lower the weight and resume from where the last search stopped
+            self.weight = max(1.0, self.weight - self.weight_step)
+            self.open_states.update(self.inconsistent)
+            self.inconsistent = {}
+            self.closed = set()
+            frontier = self.rebuild_frontier()
+
+        end_time = time.time()
+
+        self.result.set_time((end_time - start_time) * 1000)
+        self.result.set_memory(memory_tracker.peak_memory_usage())
+        self.result.set_memory_mode(memory_tracker.mode)
+        self.result.set_status(final_status(self.result, self.stop_reason))
+        self.result.set_node(self.nodes_generated)
+
+        # Stop memory tracking
+        memory_tracker.stop_tracking()
+
+    def improve_path(self, frontier, deadline, goal_count):
+        """
+        Expand states until no open state could lead to a cheaper solution at the
+        current weight. Returns False if the deadline or the budget cut the search
+        short, and sets self.stop_reason.
+        """
+        while frontier and frontier[0][0] < self.best_cost:
+            if deadline is not None and time.time() > deadline:
+                self.stop_reason = BUDGET_EXCEEDED
+                return False
+            self.stop_reason = self.budget.check(self.nodes_generated)
+            if self.stop_reason is not None:
+                return False
+
+            _, current_hash, current_cost = heapq.heappop(frontier)
+            if current_hash not in self.open_states or current_cost != self.cost_so_far[current_hash]:
+                continue  # Stale entry
+            current_key, current_on_switch = self.open_states.pop(current_hash)
+            self.closed.add(current_hash)
+            self.nodes_generated += 1
+
+            if current_on_switch == goal_count:
+                continue  # Goals are recorded when generated; nothing lies past them
+
+            current_state = self.codec.decode(current_key)
+            for neighbor_state, action, action_cost, neighbor_hash, neighbor_on_switch in self.get_neighbors(current_state, current_hash, current_on_switch):
+                new_cost = current_cost + action_cost
+                if neighbor_hash in self.cost_so_far and new_cost >= self.cost_so_far[neighbor_hash]:
+                    continue
+                self.cost_so_far[neighbor_hash] = new_cost
+                self.nodes.set(neighbor_hash, current_hash, action)
+
+                if neighbor_on_switch == goal_count and new_cost < self.best_cost:
+                    self.best_goal_hash, self.best_cost = neighbor_hash, new_cost
+
+                entry = (self.codec.encode(neighbor_state), neighbor_on_switch)
+                if neighbor_hash in self.closed:
+                    # Already expanded in this iteration: revisit it in the next one
+                    self.inconsistent[neighbor_hash] = entry
+                else:
+                    self.open_states[neighbor_hash] = entry
+                    priority = new_cost + self.weight * self.heuristic(neighbor_state)
+                    heapq.heappush(frontier, (priority, neighbor_hash, new_cost))
+        return True
+
+    def rebuild_frontier(self):
+        """Heap of every open state, keyed with the current weight."""
+        frontier = []
+        for state_hash, (state_key, _) in self.open_states.items():
+            cost = self.cost_so_far[state_hash]
+            priority = cost + self.weight * self.heuristic(self.codec.decode(state_key))
+            frontier.append((priority, state_hash, cost))
+        heapq.heapify(frontier)
+        return frontier
+
+    def lowest_f(self):
+        """Smallest unweighted g + h over open and inconsistent states, a lower bound on the optimum."""
+        lowest = self.best_cost
+        for states in (self.open_states, self.inconsistent):
+            for state_hash, (state_key, _) in states.items():
+                lowest = min(lowest, self.cost_so_far[state_hash] + self.heuristic(self.codec.decode(state_key)))
+        return lowest
+
+    def publish(self, start_time, memory_tracker):
+        """Store the best solution so far in the result and hand it to on_solution."""
+        path = self.reconstruct_path(self.best_goal_hash, self.nodes)
+        cost_steps = self.find_cost_each_step(path)
+        if self.published_cost is not None and cost_steps[-1] >= self.published_cost:
+            return  # No improvement in this iteration
+        # Ancestors of the goal may have improved since it was reached, so the replayed
+        # cost can be below the goal's g; it is a real solution, so use it as the bound
+        self.best_cost = self.published_cost = cost_steps[-1]
+        self.result.set_sequence_of_actions(path)
+        self.result.set_steps(len(path))
+        self.result.set_cost_steps(cost_steps)
+        self.result.set_total_cost(cost_steps[-1])
+        self.result.set_time((time.time() - start_time) * 1000)
+        self.result.set_memory(memory_tracker.peak_memory_usage())
+        self.result.set_memory_mode(memory_tracker.mode)
+        self.result.set_node(self.nodes_generated)
+        self.result.set_status(STOPPED_EARLY)  # Until a search at weight 1 finishes
+        print(f"Solution with cost {self.best_cost} at weight {self.weight}")
+        if self.on_solution is not None:
+            self.on_solution(self.result)
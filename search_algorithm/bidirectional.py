@@ -0,0 +1,200 @@
+import time
+from itertools import combinations
+from model.result import Result
+from model.memory import MemoryTracker
+from search_algorithm.bfs import BFS
+from search_algorithm.budget import final_status
+from search_algorithm.node_store import NodeStore
+from search_algorithm.push_search import DIRECTIONS
+
+class Bidirectional(BFS):
+    """
+    Bidirectional push/pull search.
+
+    A forward breadth-first search pushes stones from the start, and a backward one pulls
+    them away from every goal configuration (all stones on switches, Ares in any region
+    next to them; with spare switches, for every choice of switches). Both work at push
+    level on the same key, the sorted stone cells plus the canonical cell of Ares'
+    region, packed by the StateCodec, and layers are expanded on whichever side has the
+    smaller frontier. When a key is generated that the other
+    side already holds, the two halves are stitched into one chain of pushes and the
+    walks in between are filled in.
+
+    Level parsing, push deadlock checks and cost replay are shared with BFS. The result
+    is not guaranteed to be the cheapest solution.
+    """
+
+    def __init__(self, input_file="", push_level=True, budget=None):
+        # Always searches at push level; push_level is accepted so it can be built like the other solvers
+        super().__init__(input_file, push_level=True, budget=budget)
+        self.result = Result(search_algo_name = "Bidirectional")
+
+    def run(self):
+        if self.start_state == -1:
+            return
+        start_time = time.time()
+        memory_tracker = MemoryTracker()
+        self.budget.start(stats=lambda: (len(forward_frontier) + len(backward_frontier), None))  # sampled for progress reports
+        self.stop_reason = None
+
+        stone_positions = tuple(sorted(self.start_state['stones']))
+        start_state = (self.push_search.normalize(self.start_state['ares'], stone_positions), stone_positions)
+        start_key = self.state_key(start_state)
+
+        # Each side's tree of keys, with the (push, stone_position) leading to each one
+        forward_parents = NodeStore(self.codec)
+        forward_parents.add_root(start_key)
+        backward_parents = NodeStore(self.codec)
+        forward_frontier = [start_state]
+        backward_frontier = []
+        for goal_state in self.get_goal_states():
+            goal_key = self.state_key(goal_state)
+            if goal_key not in backward_parents:
+                backward_parents.add_root(goal_key)
+                backward_frontier.append(goal_state)
+
+        # A start with every stone on a switch is a goal, whichever region Ares is in
+        if self.is_goal_state(self.count_on_switch(start_state)) and start_key not in backward_parents:
+            backward_parents.add_root(start_key)
+
+        nodes_generated = 0
+        meeting_key = start_key if start_key in backward_parents else None
+
+        while meeting_key is None and forward_frontier and backward_frontier and self.stop_reason is None:
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meeting_key, nodes = self.expand_layer(
+                    forward_frontier, forward_parents, backward_parents, self.get_forward_moves, nodes_generated)
+            else:
+                backward_frontier, meeting_key, nodes = self.expand_layer(
+                    backward_frontier, backward_parents, forward_parents, self.get_backward_moves, nodes_generated)
+            nodes_generated += nodes
+
+        if meeting_key is not None:
+            print("Goal reached!")
+            path = self.stitch_path(meeting_key, forward_parents, backward_parents)
+            self.result.set_sequence_of_actions(path)
+            self.result.set_steps(len(path))
+            self.result.set_cost_steps(self.find_cost_each_step(path))
+            total_cost = self.result.get_cost_steps()[-1]
+            self.result.set_total_cost(total_cost)
+
+        end_time = time.time()
+
+        self.result.set_time((end_time - start_time) * 1000)
+        self.result.set_memory(memory_tracker.peak_memory_usage())
+        self.result.set_memory_mode(memory_tracker.mode)
+        self.result.set_status(final_status(self.result, self.stop_reason))
+        self.result.set_node(nodes_generated)
+
+        memory_tracker.stop_tracking()
+
+    def state_key(self, state):
+        ares_position, stone_positions = state
+        return self.codec.encode((ares_position, tuple(sorted(stone_positions))))
+
+    def expand_layer(self, frontier, parents, other_parents, get_moves, nodes_before=0):
+        """
+        Expand one whole breadth-first layer on one side.
+
+        Returns (next_frontier, meeting_key, nodes_expanded); meeting_key is set as soon
+        as a generated state is already known to the other side. If the budget runs out
+        the layer is left unfinished and self.stop_reason is set.
+        """
+        next_frontier = []
+        nodes_expanded = 0
+        for state in frontier:
+            nodes_expanded += 1
+            self.stop_reason = self.budget.check(nodes_before + nodes_expanded)
+            if self.stop_reason is not None:
+                break
+            current_key = self.state_key(state)
+            for new_state, push in get_moves(state):
+                new_key = self.state_key(new_state)
+                if new_key in parents:
+                    continue
+                parents.set(new_key, current_key, push)
+                if new_key in other_parents:
+                    return next_frontier, new_key, nodes_expanded
+                next_frontier.append(new_state)
+        return next_frontier, None, nodes_expanded
+
+    def get_forward_moves(self, state):
+        """Pushes from this state as (new_state, (push, stone_position))."""
+        moves = []
+        _, stone_positions = state
+        for stone_index, action, new_stone_position, _ in self.push_search.get_pushes(state):
+            if new_stone_position in stone_positions:  # get_pushes already left out walls
+                continue
+
+            new_stone_positions = list(stone_positions)
+            stone_position = new_stone_positions[stone_index]
+            new_stone_positions[stone_index] = new_stone_position
+
+            if self.is_deadlock(new_stone_positions, new_stone_position):
+                continue
+
+            new_ares_position = self.push_search.normalize(stone_position, new_stone_positions)
+            moves.append(((new_ares_position, tuple(new_stone_positions)), (action, stone_position)))
+        return moves
+
+    def get_backward_moves(self, state):
+        """
+        Pulls from this state as (previous_state, (push, stone_position)).
+
+        Undoing a push in direction d of a stone now on `stone`: Ares was standing on
+        stone - d right after the push (so that cell must be in his region now) and on
+        stone - 2d before it (so that cell must be free). The returned push is the forward
+        push that leads from previous_state back to this state.
+        """
+        moves = []
+        ares_position, stone_positions = state
+        stones_set = set(stone_positions)
+        bits = self.push_search.board.bits
+        region = self.push_search.region(ares_position, stone_positions)
+
+        for stone_index, (x, y) in enumerate(stone_positions):
+            for action, (dx, dy) in DIRECTIONS.items():
+                pulled_to = (x - dx, y - dy)
+                ares_from = (x - 2 * dx, y - 2 * dy)
+                if pulled_to not in bits or not bits[pulled_to] & region:
+                    continue
+                if not self.dead_squares.is_floor(ares_from) or ares_from in stones_set:
+                    continue
+
+                previous_stone_positions = list(stone_positions)
+                previous_stone_positions[stone_index] = pulled_to
+                previous_ares_position = self.push_search.normalize(ares_from, previous_stone_positions)
+                previous_state = (previous_ares_position, tuple(previous_stone_positions))
+                moves.append((previous_state, (action.upper(), pulled_to)))
+        return moves
+
+    def get_goal_states(self):
+        """
+        Every goal configuration: all stones on switches, Ares in any region next to a
+        stone. With spare switches, each choice of as many switches as there are stones
+        is a configuration of its own. Only cells the StateCodec indexes (reachable from
+        the start) are used; switches anywhere else can never hold a stone.
+        """
+        bits = self.push_search.board.bits
+        goal_states = []
+        for stone_positions in combinations(sorted(self.start_state['switches']), len(self.start_state['stones'])):
+            if not all(switch in bits for switch in stone_positions):
+                continue
+            stones_set = set(stone_positions)
+            covered = set()
+            for x, y in stone_positions:
+                for dx, dy in DIRECTIONS.values():
+                    cell = (x + dx, y + dy)
+                    if cell in covered or cell in stones_set or cell not in bits:
+                        continue
+                    covered.update(self.push_search.reachable(cell, stones_set))
+                    goal_states.append((self.push_search.normalize(cell, stone_positions), stone_positions))
+        return goal_states
+
+    def stitch_path(self, meeting_key, forward_parents, backward_parents):
+        """Join start -> meeting (forward parents) and meeting -> goal (backward parents)."""
+        # The backward tree is rooted at the goals, so its path is walked back to front
+        pushes = forward_parents.path(meeting_key) + backward_parents.path(meeting_key)[::-1]
+
+        start_state = (self.start_state['ares'], self.start_state['stones'])
+        return self.push_search.expand_path(start_state, pushes)
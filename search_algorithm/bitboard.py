@@ -0,0 +1,46 @@
+class Bitboard:
+    """
+    Ares-reachability on Python big-int bitboards.
+
+    Cell (x, y) is bit y * stride + x, with stride = width + 1: the extra column is
+    never floor, so shifting a board one bit left or right can't wrap a cell onto the
+    neighbouring row. `floor` has a bit for every cell Ares or a stone can occupy, and
+    stones are passed as another board (occupancy()).
+
+    reachable() grows Ares' region by shifting it one cell in all four directions at
+    once and masking with the free cells, until it stops growing. Each step is a few
+    big-int operations over the whole level, so the flood fill costs one step per unit
+    of region depth instead of a set and tuple lookups per cell.
+    """
+
+    def __init__(self, cells):
+        self.stride = max((x for x, _ in cells), default=0) + 2
+        self.bits = {(x, y): 1 << (y * self.stride + x) for x, y in cells}
+        self.floor = 0
+        for bit in self.bits.values():
+            self.floor |= bit
+
+    def occupancy(self, positions):
+        """Board with the given cells set."""
+        bits = self.bits
+        board = 0
+        for position in positions:
+            board |= bits[position]
+        return board
+
+    def reachable(self, start, blocked=0):
+        """Board of the cells Ares can walk to from start without crossing blocked cells."""
+        free = self.floor & ~blocked
+        stride = self.stride
+        region = self.bits[start]
+        while True:
+            grown = (region | region << 1 | region >> 1 | region << stride | region >> stride) & free
+            if grown == region:
+                return region
+            region = grown
+
+    def min_cell(self, board):
+        """Smallest set cell in row-major order (lowest y, then lowest x)."""
+        index = (board & -board).bit_length() - 1
+        y, x = divmod(index, self.stride)
+        return x, y
@@ -0,0 +1,153 @@
+import time
+import threading
+
+# Result statuses
+SOLVED = "solved"
+UNSOLVABLE = "unsolvable"            # The whole (pruned) search space was explored
+BUDGET_EXCEEDED = "budget exceeded"  # Stopped by max_nodes, max_time or max_memory_mb
+CANCELLED = "cancelled"              # Stopped through the cancellation token
+STOPPED_EARLY = "stopped early"      # Has a solution, but was stopped before proving it the best one
+
+class CancellationToken:
+    """Set from any thread (e.g. the GUI) to ask a running search to stop."""
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def cancel(self):
+        self.event.set()
+
+    def is_cancelled(self):
+        return self.event.is_set()
+
+class SearchProgress:
+    """One progress sample of a running search, as passed to on_progress."""
+
+    def __init__(self, nodes, frontier, nodes_per_second, bound, elapsed, memory_mb):
+        self.nodes = nodes                        # nodes expanded so far (None if not counted)
+        self.frontier = frontier                  # open states (None if the solver has no frontier)
+        self.nodes_per_second = nodes_per_second  # since the previous sample (None if nodes aren't counted)
+        self.bound = bound                        # best f / cost bound (None if not applicable)
+        self.elapsed = elapsed                    # seconds
+        self.memory_mb = memory_mb                # process RSS (plus its workers' for HDA* and Portfolio)
+
+    def __str__(self):
+        parts = []
+        if self.nodes is not None:
+            parts.append(f"Nodes: {self.nodes}")
+        if self.frontier is not None:
+            parts.append(f"Frontier: {self.frontier}")
+        if self.nodes_per_second is not None:
+            parts.append(f"Nodes/s: {self.nodes_per_second:.0f}")
+        if self.bound is not None:
+            parts.append(f"Bound: {self.bound:g}")
+        parts.append(f"Elapsed: {self.elapsed:.1f} s")
+        parts.append(f"Memory: {self.memory_mb:.1f} MB")
+        return ", ".join(parts)
+
+class SearchBudget:
+    """
+    Limits on one search, checked from the solver's main loop.
+
+    Any limit left as None is unlimited. check(nodes) is called once per expanded node
+    but only does real work every check_interval nodes (and exactly at max_nodes), so
+    the hot loop pays a single comparison. Memory is the process' RSS (psutil, imported
+    only if a memory limit is set or progress is reported); solvers that search in
+    worker processes (HDA*, Portfolio) pass with_children=True to start() so their
+    workers' RSS is added to it.
+
+    The same slow path reports progress: if on_progress is set, it is called with a
+    SearchProgress at most every progress_interval seconds. The frontier size and bound
+    come from the `stats` callable a solver passes to start(), returning
+    (frontier_size, bound); it is only called when a sample is taken.
+    """
+
+    def __init__(self, max_nodes=None, max_time=None, max_memory_mb=None, cancellation=None, check_interval=256,
+                 on_progress=None, progress_interval=0.5):
+        self.max_nodes = max_nodes
+        self.max_time = max_time                # seconds
+        self.max_memory_mb = max_memory_mb
+        self.cancellation = cancellation
+        self.check_interval = check_interval
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval  # seconds
+        self.process = None
+        self.start()
+
+    def start(self, stats=None, with_children=False):
+        """Restart the clock; solvers call this when their search begins."""
+        self.start_time = time.time()
+        self.next_check = 0
+        self.stats = stats
+        self.with_children = with_children  # Listing child processes costs too much for every check
+        self.last_report = (self.start_time, 0)  # (time, nodes) of the last progress sample
+
+    def check(self, nodes):
+        """None while the search may go on, otherwise the status to stop with."""
+        if nodes < self.next_check:
+            return None
+        self.next_check = nodes + self.check_interval
+        if self.max_nodes is not None and nodes < self.max_nodes:
+            self.next_check = min(self.next_check, self.max_nodes)
+        return self.poll(nodes)
+
+    def poll(self, nodes):
+        """
+        check() without the node interval, for callers that wait between checks anyway.
+        nodes may be None for callers that don't count nodes (no node limit then applies).
+        """
+        if self.on_progress is not None and time.time() - self.last_report[0] >= self.progress_interval:
+            self.report(nodes)
+        return self.stop_reason(nodes)
+
+    def report(self, nodes):
+        """Pass a progress sample to on_progress."""
+        now = time.time()
+        last_time, last_nodes = self.last_report
+        self.last_report = (now, nodes)
+        frontier, bound = self.stats() if self.stats is not None else (None, None)
+        if nodes is None:
+            nodes_per_second = None
+        else:
+            nodes_per_second = (nodes - last_nodes) / (now - last_time) if now > last_time else 0.0
+        self.on_progress(SearchProgress(nodes, frontier, nodes_per_second, bound, now - self.start_time, self.memory_mb()))
+
+    def memory_mb(self):
+        import psutil
+        if self.process is None:
+            self.process = psutil.Process()
+        rss = self.process.memory_info().rss
+        if self.with_children:
+            for child in self.process.children(recursive=True):
+                try:
+                    rss += child.memory_info().rss
+                except psutil.Error:
+                    pass  # Exited since it was listed
+        return rss / (1024 * 1024)
+
+    def stop_reason(self, nodes=0):
+        if self.cancellation is not None and self.cancellation.is_cancelled():
+            return CANCELLED
+        if self.max_nodes is not None and nodes is not None and nodes >= self.max_nodes:
+            return BUDGET_EXCEEDED
+        if self.max_time is not None and time.time() - self.start_time >= self.max_time:
+            return BUDGET_EXCEEDED
+        if self.max_memory_mb is not None and self.memory_mb() >= self.max_memory_mb:
+            return BUDGET_EXCEEDED
+        return None
+
+    def remaining_time(self):
+        """Seconds left before max_time, or None without a time limit."""
+        if self.max_time is None:
+            return None
+        return max(0.0, self.max_time - (time.time() - self.start_time))
+
+def final_status(result, stop_reason):
+    """
+    Status of a finished search: solved if it has a solution and ran to the end,
+    stopped early if it has one but was cut short (an anytime solver's best so far),
+    else why it stopped.
+    """
+    if result.get_cost_steps():
+        return SOLVED if stop_reason is None else STOPPED_EARLY
+    return stop_reason or UNSOLVABLE
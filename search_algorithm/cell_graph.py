@@ -0,0 +1,53 @@
+# Direction order matches push_search.DIRECTIONS: (action, dx, dy)
+DIRECTIONS = (('u', 0, -1), ('l', -1, 0), ('d', 0, 1), ('r', 1, 0))
+
+class CellGraph:
+    """
+    Precomputed adjacency of the cells Ares and the stones can reach.
+
+    Every such cell has an integer id (its StateCodec index), used only as its bit
+    position: stones are tracked as an occupancy bitset, an int with bit id set for
+    each stone, so testing whether a cell is free is a single AND.
+
+    The solvers' states, hashes and deadlock tables are keyed by (x, y) positions, so
+    there are no id-indexed tables; every table is a dict keyed by position, ready to
+    iterate:
+    - moves[position]: (action, next_position, push_target) for each direction that
+      isn't a wall, push_target being None if a stone there can't be pushed on
+    - pushes[position]: (push_action, push_from, push_target) for each direction a
+      stone on position can be pushed, i.e. both cells around it are floor
+    - bits[position]: 1 << id, the cell's bit in an occupancy bitset
+    """
+
+    def __init__(self, cells):
+        self.cells = list(cells)  # id -> (x, y)
+        self.bits = {cell: 1 << index for index, cell in enumerate(self.cells)}
+
+        # Floor next to a reachable cell is reachable too, so any neighbour without
+        # an id is a wall
+        bits = self.bits
+        self.moves = {}
+        self.pushes = {}
+        for x, y in self.cells:
+            moves = []
+            pushes = []
+            for action, dx, dy in DIRECTIONS:
+                neighbor = (x + dx, y + dy)
+                if neighbor not in bits:
+                    continue
+                push_target = (x + 2 * dx, y + 2 * dy)
+                moves.append((action, neighbor, push_target if push_target in bits else None))
+                # A push in this direction needs floor on both sides of the stone
+                behind = (x - dx, y - dy)
+                if behind in bits:
+                    pushes.append((action.upper(), behind, neighbor))
+            self.moves[(x, y)] = tuple(moves)
+            self.pushes[(x, y)] = tuple(pushes)
+
+    def occupancy(self, positions):
+        """Bitset of the given cells."""
+        bits = self.bits
+        occupied = 0
+        for position in positions:
+            occupied |= bits[position]
+        return occupied
@@ -0,0 +1,178 @@
+from model.level import uses_level_grid
+from search_algorithm.push_distance import UNREACHABLE
+
+DIRECTIONS = ((0, -1), (-1, 0), (0, 1), (1, 0))
+
+class DeadSquareTable:
+    """
+    Per-level table of dead squares: cells from which a stone can never reach any switch.
+
+    Built once by pulling a virtual stone backwards from every switch. A pull from
+    (x, y) to (x + dx, y + dy) needs Ares to stand on (x + dx, y + dy) and step back
+    to (x + 2dx, y + 2dy), so both cells must be floor. Every cell the virtual stone
+    can be pulled to is live; everything else is dead. On large levels the pulls are
+    done on whole NumPy masks (LevelGrid). The result is stored as flat bytearrays
+    indexed by y * width + x, so a lookup during search is O(1).
+    """
+
+    def __init__(self, maze, switches):
+        self.width = max(len(row) for row in maze)
+        self.height = len(maze)
+
+        if uses_level_grid(maze):
+            from model.grid import LevelGrid  # Imports NumPy
+            grid = LevelGrid(maze)
+            self.dead = bytearray((grid.pull_distances(switches) == UNREACHABLE).tobytes())
+            self.floor = bytearray(grid.floor.tobytes())
+            return
+
+        self.floor = bytearray(self.width * self.height)
+        for y, row in enumerate(maze):
+            for x, cell in enumerate(row):
+                if cell != '#':
+                    self.floor[y * self.width + x] = 1
+
+        self.dead = bytearray(b'\x01') * (self.width * self.height)
+        live = set(switches)
+        stack = list(switches)
+        while stack:
+            x, y = stack.pop()
+            for dx, dy in DIRECTIONS:
+                stone_position = (x + dx, y + dy)
+                if stone_position in live:
+                    continue
+                if self.is_floor(stone_position) and self.is_floor((x + 2 * dx, y + 2 * dy)):
+                    live.add(stone_position)
+                    stack.append(stone_position)
+
+        for x, y in live:
+            self.dead[y * self.width + x] = 0
+
+    def is_floor(self, position):
+        x, y = position
+        return 0 <= y < self.height and 0 <= x < self.width and self.floor[y * self.width + x] == 1
+
+    def is_dead(self, position):
+        """Check if a stone on this cell can never be pushed onto a switch."""
+        return self.dead[position[1] * self.width + position[0]] == 1
+
+
+def is_freeze_deadlock(maze, dead_squares, stones_set, moved_stone):
+    """
+    Check if the stone that was just pushed froze a group of stones off the switches.
+
+    A stone is frozen when it can't move along either axis: on an axis it is blocked
+    by a wall, by dead squares on both sides, or by a neighbour stone that is itself
+    frozen. While checking a neighbour, stones on the recursion stack are treated as
+    walls, which both stops the recursion and models stones blocking each other.
+    The position is a deadlock if any of the frozen stones is not on a switch.
+    """
+    visited = set()
+    frozen_stones = []
+
+    def is_blocked(position, dx, dy):
+        before = (position[0] - dx, position[1] - dy)
+        after = (position[0] + dx, position[1] + dy)
+        for x, y in (before, after):
+            if maze[y][x] == '#' or (x, y) in visited:
+                return True
+        if dead_squares.is_dead(before) and dead_squares.is_dead(after):
+            return True
+        for side in (before, after):
+            if side in stones_set and is_frozen(side):
+                return True
+        return False
+
+    def is_frozen(position):
+        visited.add(position)
+        if is_blocked(position, 1, 0) and is_blocked(position, 0, 1):
+            frozen_stones.append(position)
+            return True
+        visited.discard(position)  # Only stones known to be stuck may act as walls
+        return False
+
+    if not is_frozen(moved_stone):
+        return False
+    return any(maze[y][x] != '.' for x, y in frozen_stones)
+
+
+def find_pi_corral(maze, dead_squares, stone_positions, reachable_cells):
+    """
+    Look for a PI-corral among the areas Ares can't reach.
+
+    A corral is a connected area of free cells Ares can't walk into; its boundary
+    stones are the stones touching it. It is an I-corral when no boundary stone can
+    ever be pushed anywhere but into the corral (pushes blocked only by other stones
+    count as possible, since those stones may move), and a PI-corral when Ares can
+    already reach every one of those inward pushes. Until such a corral is opened
+    nothing else can help solve it, so only its pushes need to be expanded.
+
+    Returns None if there is no unsolved PI-corral, otherwise the set of indices of
+    the boundary stones of the one with the fewest pushes. An empty set means the
+    corral can never be opened and the position is a deadlock.
+    """
+    stone_index = {stone: i for i, stone in enumerate(stone_positions)}
+    seen = set()
+    best_stones = None
+    best_pushes = 0
+
+    for x, y in stone_positions:
+        for dx, dy in DIRECTIONS:
+            start = (x + dx, y + dy)
+            if start in seen or start in reachable_cells or start in stone_index or not dead_squares.is_floor(start):
+                continue
+
+            # Flood fill the corral and collect the stones on its boundary
+            corral = {start}
+            boundary = set()
+            stack = [start]
+            while stack:
+                cx, cy = stack.pop()
+                for ndx, ndy in DIRECTIONS:
+                    cell = (cx + ndx, cy + ndy)
+                    if cell in stone_index:
+                        boundary.add(stone_index[cell])
+                    elif cell not in corral and dead_squares.is_floor(cell):
+                        corral.add(cell)
+                        stack.append(cell)
+            seen |= corral
+
+            pushes = count_corral_pushes(maze, dead_squares, stone_positions, reachable_cells, corral, boundary)
+            if pushes is None:
+                continue
+            if pushes == 0:
+                return set()
+            if best_stones is None or pushes < best_pushes:
+                best_stones = boundary
+                best_pushes = pushes
+
+    return best_stones
+
+
+def count_corral_pushes(maze, dead_squares, stone_positions, reachable_cells, corral, boundary):
+    """Count the inward pushes of an unsolved PI-corral, or return None if the corral isn't one."""
+    solved = all(maze[y][x] != '.' for x, y in corral)
+    pushes = 0
+
+    for i in boundary:
+        x, y = stone_positions[i]
+        if maze[y][x] != '.':
+            solved = False
+
+        for dx, dy in DIRECTIONS:
+            ares_side = (x - dx, y - dy)
+            target = (x + dx, y + dy)
+            # Pushes from inside the corral have to wait until it's opened
+            if ares_side in corral or not dead_squares.is_floor(ares_side):
+                continue
+            if not dead_squares.is_floor(target) or dead_squares.is_dead(target):
+                continue
+            if target not in corral:
+                return None  # The stone may be pushed out of the corral: not an I-corral
+            if ares_side not in reachable_cells:
+                return None  # Ares can't make this push yet: not a PI-corral
+            pushes += 1
+
+    if solved:
+        return None
+    return pushes
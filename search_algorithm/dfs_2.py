@@ -2,81 +2,14 @@ import time
 from collections import deque
 from model.memory import MemoryTracker
 from model.result import Result
+from model.level import load_level
 
 class DFS:
     def __init__(self, input_file=""):
         self.input_file = input_file
         self.result = Result(search_algo_name="DFS")
-        self.start_state = self.get_start_state(input_file)
-
-    def get_start_state(self, input_file=""):
-        if not input_file:
-            raise ValueError("No input file provided.")
-
-        with open(input_file, "r") as f:
-            lines = f.readlines()
-        
-        if not lines:
-            raise ValueError("Input file is empty.")
-
-        maze = []           # 2D list representing the maze
-        ares_position = None
-        stone_positions = []
-        stone_weights = []
-        switch_positions = []
-        max_length_row = 0
-
-        # Parse the file line by line
-        for i, line in enumerate(lines):
-            if i == 0:  # First line contains stone weights
-                stone_weights = list(map(int, line.strip().split()))
-                continue
-            
-            line = line.rstrip('\n')
-            row = []  # To store the current row of the maze
-            max_length_row = max(max_length_row, len(line))
-            
-            for j, char in enumerate(line):
-                if char == '@':     # Ares' position
-                    ares_position = (j, i - 1)
-                    row.append(' ') # Ares is movable -> free space
-                elif char == '*':   # Stone on a switch position
-                    stone_positions.append((j, i - 1))
-                    switch_positions.append((j, i - 1))
-                    row.append('.') 
-                elif char == '+':   # Ares on a switch position
-                    ares_position = (j, i - 1)
-                    switch_positions.append((j, i - 1))
-                    row.append('.')
-                elif char == '$':   # Stone position
-                    stone_positions.append((j, i - 1))
-                    row.append(' ') # Stones are considered as movable objects -> free space
-                elif char == '.':   # Switch position
-                    switch_positions.append((j, i - 1))
-                    row.append('.') 
-                elif char == '#':   # Wall
-                    row.append('#') 
-                else:
-                    row.append(' ') 
-            maze.append(row)        # Add the row to the maze
-
-        # Ensure the number of weights matches the number of stones
-        if len(stone_weights) != len(stone_positions):
-            raise ValueError("Number of stone weights does not match the number of stones.")
-        
-        # Pad rows to ensure consistent length
-        for row in maze:
-            if len(row) < max_length_row:
-                row.extend([' '] * (max_length_row - len(row)))
-
-        return {
-            'ares': ares_position,
-            'stones': tuple(stone_positions),
-            'stone_weights': tuple(stone_weights),
-            'switches': tuple(switch_positions),
-            'maze': tuple(maze),
-            'cost': 0
-        }
+        self.level = load_level(input_file)
+        self.start_state = self.level.start_state()
 
     def get_result(self):
         return self.result
@@ -119,6 +52,7 @@ class DFS:
 
         self.result.set_time((end_time - start_time) * 1000)
         self.result.set_memory(memory_tracker.peak_memory_usage()) 
+        self.result.set_memory_mode(memory_tracker.mode)
         self.result.set_node(nodes_generated)
 
         memory_tracker.stop_tracking()
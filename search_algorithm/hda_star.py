@@ -0,0 +1,304 @@
+import time
+import heapq
+import queue
+import multiprocessing
+from model.result import Result
+from model.memory import MemoryTracker
+from search_algorithm.a_star import A_star
+from search_algorithm.budget import final_status
+
+INFINITY = float('inf')
+EXPANSIONS_PER_BATCH = 64  # Outgoing states are flushed after this many expansions
+
+def owner_of(state_hash, workers):
+    return state_hash % workers
+
+class SharedSearchState:
+    """
+    Counters shared by all HDA* workers, guarded by one lock.
+
+    `sent` and `received` count state batches put on and taken off the inboxes, and
+    `idle` flags workers with nothing worth expanding. The search is over once every
+    worker is idle and no batch is in flight (sent == received); because a receiver
+    clears its idle flag in the same locked step that counts the batch, this can't
+    trigger while states are still on their way. `best_cost` / `best_hash` hold the
+    cheapest goal generated so far.
+    """
+
+    def __init__(self, context, workers):
+        self.lock = context.Lock()
+        self.sent = context.Value('q', 0, lock=False)
+        self.received = context.Value('q', 0, lock=False)
+        self.idle = context.Array('b', workers, lock=False)
+        self.best_cost = context.Value('d', INFINITY, lock=False)
+        self.best_hash = context.Value('Q', 0, lock=False)
+        self.expanded = context.Value('q', 0, lock=False)  # nodes expanded by all workers
+        self.done = context.Event()
+
+    def count_sent(self):
+        with self.lock:
+            self.sent.value += 1
+
+    def count_received(self, worker_id):
+        with self.lock:
+            self.idle[worker_id] = 0
+            self.received.value += 1
+
+    def report_goal(self, state_hash, cost):
+        with self.lock:
+            if cost < self.best_cost.value:
+                self.best_cost.value = cost
+                self.best_hash.value = state_hash
+
+    def count_expanded(self, nodes):
+        with self.lock:
+            self.expanded.value += nodes
+
+    def report_idle(self, worker_id):
+        with self.lock:
+            self.idle[worker_id] = 1
+            if all(self.idle) and self.sent.value == self.received.value:
+                self.done.set()
+
+class HDAWorker:
+    """One HDA* worker: an A* over the states whose hash maps to worker_id."""
+
+    def __init__(self, worker_id, input_file, options, inboxes, replies, shared):
+        self.worker_id = worker_id
+        self.workers = len(inboxes)
+        self.inboxes = inboxes
+        self.replies = replies
+        self.shared = shared
+        # Every worker builds the same tables, so hashes and packed keys agree
+        self.solver = A_star(input_file, **options)
+        self.goal_count = len(self.solver.start_state['stones'])
+        self.frontier = []
+        self.cost_so_far = {}
+        self.parent_map = {}
+        self.outboxes = [[] for _ in inboxes]
+        self.nodes_expanded = 0
+        self.pending = []
+
+    def run(self):
+        memory_tracker = MemoryTracker()
+        self.search()
+        self.serve_requests(memory_tracker)
+
+    def search(self):
+        inbox = self.inboxes[self.worker_id]
+        shared = self.shared
+        while not shared.done.is_set():
+            self.drain_inbox()
+            if self.frontier and self.frontier[0][0] < shared.best_cost.value:
+                self.expand_batch()
+                self.flush_outboxes()
+            else:
+                self.flush_outboxes()
+                shared.report_idle(self.worker_id)
+                try:
+                    message = inbox.get(timeout=0.005)
+                except queue.Empty:
+                    continue
+                self.handle_message(message)
+
+    def drain_inbox(self):
+        inbox = self.inboxes[self.worker_id]
+        while True:
+            try:
+                message = inbox.get(block=False)
+            except queue.Empty:
+                return
+            self.handle_message(message)
+
+    def handle_message(self, message):
+        kind, payload = message
+        if kind == 'states':
+            self.shared.count_received(self.worker_id)
+            for entry in payload:
+                self.add_state(*entry)
+        else:
+            # A path request that raced the end of the search
+            self.pending.append(message)
+
+    def add_state(self, state_hash, state_key, on_switch, cost, parent_hash, action):
+        if state_hash in self.cost_so_far and cost >= self.cost_so_far[state_hash]:
+            return
+        self.cost_so_far[state_hash] = cost
+        self.parent_map[state_hash] = (parent_hash, action) if parent_hash is not None else None
+        priority = cost + self.solver.heuristic(self.solver.codec.decode(state_key))
+        heapq.heappush(self.frontier, (priority, state_hash, cost, state_key, on_switch))
+
+    def expand_batch(self):
+        nodes_before = self.nodes_expanded
+        self.expand_states()
+        self.shared.count_expanded(self.nodes_expanded - nodes_before)
+
+    def expand_states(self):
+        solver = self.solver
+        shared = self.shared
+        for _ in range(EXPANSIONS_PER_BATCH):
+            if not self.frontier or self.frontier[0][0] >= shared.best_cost.value:
+                return
+            _, current_hash, current_cost, current_key, current_on_switch = heapq.heappop(self.frontier)
+            if current_cost != self.cost_so_far[current_hash]:
+                continue  # Stale entry
+            self.nodes_expanded += 1
+            if current_on_switch == self.goal_count:
+                continue
+
+            current_state = solver.codec.decode(current_key)
+            for neighbor_state, action, action_cost, neighbor_hash, neighbor_on_switch in solver.get_neighbors(current_state, current_hash, current_on_switch):
+                new_cost = current_cost + action_cost
+                if neighbor_on_switch == self.goal_count and new_cost < shared.best_cost.value:
+                    shared.report_goal(neighbor_hash, new_cost)
+                entry = (neighbor_hash, solver.codec.encode(neighbor_state), neighbor_on_switch, new_cost, current_hash, action)
+                owner = owner_of(neighbor_hash, self.workers)
+                if owner == self.worker_id:
+                    self.add_state(*entry)
+                else:
+                    self.outboxes[owner].append(entry)
+
+    def flush_outboxes(self):
+        for owner, outbox in enumerate(self.outboxes):
+            if outbox:
+                self.shared.count_sent()  # Counted before it is put, so it is never missed
+                self.inboxes[owner].put(('states', outbox))
+                self.outboxes[owner] = []
+
+    def serve_requests(self, memory_tracker):
+        """After the search: answer path lookups until told to stop."""
+        inbox = self.inboxes[self.worker_id]
+        while True:
+            kind, payload = self.pending.pop(0) if self.pending else inbox.get()
+            if kind == 'path':
+                self.replies.put(self.path_segment(payload))
+            elif kind == 'stop':
+                self.replies.put((self.nodes_expanded, memory_tracker.peak_memory_usage()))
+                memory_tracker.stop_tracking()
+                return
+
+    def path_segment(self, state_hash):
+        """Actions leading to state_hash, back to the first state owned by another worker."""
+        actions = []
+        while owner_of(state_hash, self.workers) == self.worker_id:
+            parent = self.parent_map[state_hash]
+            if parent is None:
+                return actions, None
+            state_hash, action = parent
+            actions.append(action)
+        return actions, state_hash
+
+def run_worker(worker_id, input_file, options, inboxes, replies, shared):
+    HDAWorker(worker_id, input_file, options, inboxes, replies, shared).run()
+
+class HDA_star(A_star):
+    """
+    Hash-distributed A* (HDA*) over several worker processes.
+
+    Every state is owned by the worker its Zobrist hash maps to (hash % workers), which
+    keeps its open-list entry, best cost and parent. A worker expands its cheapest states
+    and sends each successor to its owner, batched per destination, through that owner's
+    inbox queue. The cheapest goal found so far is shared; states whose f is not below it
+    are never expanded, so once all workers run out of such states and no batch is in
+    flight, that goal is optimal. The path is then rebuilt by asking the owners for their
+    stretch of the parent chain, and the result carries the same fields as A_star's
+    (nodes and memory are summed over the workers).
+    """
+
+    def __init__(self, input_file="", push_level=False, corral_pruning=False, workers=None, budget=None):
+        super().__init__(input_file, push_level=push_level, corral_pruning=corral_pruning, budget=budget)
+        self.result = Result(search_algo_name = "HDA*")
+        self.workers = workers or multiprocessing.cpu_count()
+
+    def run(self):
+        if self.start_state == -1:
+            return
+        start_time = time.time()
+
+        # Initialize memory tracker
+        memory_tracker = MemoryTracker()
+        # Progress shows the cheapest goal found so far as the bound
+        self.budget.start(stats=lambda: (None, shared.best_cost.value if shared.best_cost.value < INFINITY else None),
+                          with_children=True)
+        stop_reason = None
+
+        start_state = (self.start_state['ares'], tuple(self.start_state['stones']))
+        start_hash = self.zobrist.hash_state(start_state)
+        start_on_switch = self.count_on_switch(start_state)
+        nodes_generated = 0
+        peak_memory = 0
+
+        if start_on_switch == len(self.start_state['stones']):
+            self.set_path([])
+        else:
+            context = multiprocessing.get_context("spawn")
+            shared = SharedSearchState(context, self.workers)
+            inboxes = [context.Queue() for _ in range(self.workers)]
+            replies = context.Queue()
+            options = {'push_level': self.push_level, 'corral_pruning': self.corral_pruning}
+            processes = [context.Process(target=run_worker, args=(worker_id, self.input_file, options, inboxes, replies, shared), daemon=True)
+                         for worker_id in range(self.workers)]
+            for process in processes:
+                process.start()
+
+            try:
+                shared.count_sent()
+                start_entry = (start_hash, self.codec.encode(start_state), start_on_switch, 0, None, None)
+                inboxes[owner_of(start_hash, self.workers)].put(('states', [start_entry]))
+                # Expansions happen in the workers; their shared count is checked
+                # against the budget between short waits
+                while not shared.done.wait(0.05):
+                    stop_reason = self.budget.poll(shared.expanded.value)
+                    if stop_reason is not None:
+                        shared.done.set()
+                        break
+
+                # A stopped search may leave parents in unread batches, so its path isn't collected
+                if stop_reason is None and shared.best_cost.value < INFINITY:
+                    self.set_path(self.collect_path(shared.best_hash.value, inboxes, replies))
+
+                for inbox in inboxes:
+                    inbox.put(('stop', None))
+                for _ in processes:
+                    worker_nodes, worker_memory = replies.get()
+                    nodes_generated += worker_nodes
+                    peak_memory += worker_memory
+            finally:
+                for process in processes:
+                    process.join(timeout=5)
+                    if process.is_alive():
+                        process.terminate()
+
+        end_time = time.time()
+
+        self.result.set_time((end_time - start_time) * 1000)
+        self.result.set_memory(memory_tracker.peak_memory_usage() + peak_memory)
+        self.result.set_memory_mode(memory_tracker.mode)
+        self.result.set_status(final_status(self.result, stop_reason))
+        self.result.set_node(nodes_generated)
+
+        # Stop memory tracking
+        memory_tracker.stop_tracking()
+
+    def collect_path(self, goal_hash, inboxes, replies):
+        """Follow the parent chain from the goal back to the start, one owner at a time."""
+        actions = []
+        state_hash = goal_hash
+        while state_hash is not None:
+            inboxes[owner_of(state_hash, self.workers)].put(('path', state_hash))
+            segment, state_hash = replies.get()
+            actions.extend(segment)
+        return actions[::-1]
+
+    def set_path(self, actions):
+        if self.push_level:
+            # Each action is a single (push, stone_position); fill in the walks between them
+            start_state = (self.start_state['ares'], self.start_state['stones'])
+            path = self.push_search.expand_path(start_state, actions)
+        else:
+            path = ''.join(actions)
+        self.result.set_sequence_of_actions(path)
+        self.result.set_steps(len(path))
+        self.result.set_cost_steps(self.find_cost_each_step(path))
+        total_cost = self.result.get_cost_steps()[-1]
+        self.result.set_total_cost(total_cost)
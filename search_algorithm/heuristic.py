@@ -0,0 +1,100 @@
+from search_algorithm.push_distance import UNREACHABLE
+
+INFINITY = float('inf')
+
+def min_cost_assignment(cost_matrix):
+    """
+    Hungarian algorithm: cost of the cheapest one-to-one assignment of rows to columns.
+
+    cost_matrix is a square list of lists; runs in O(n^3) using row/column potentials.
+    """
+    n = len(cost_matrix)
+    u = [0] * (n + 1)           # row potentials
+    v = [0] * (n + 1)           # column potentials
+    match = [0] * (n + 1)       # match[column] = row assigned to it (1-based, 0 = free)
+    way = [0] * (n + 1)
+
+    for row in range(1, n + 1):
+        match[0] = row
+        column = 0
+        min_slack = [INFINITY] * (n + 1)
+        used = [False] * (n + 1)
+        while match[column] != 0:
+            used[column] = True
+            current_row = match[column]
+            delta = INFINITY
+            next_column = 0
+            costs = cost_matrix[current_row - 1]
+            for j in range(1, n + 1):
+                if not used[j]:
+                    slack = costs[j - 1] - u[current_row] - v[j]
+                    if slack < min_slack[j]:
+                        min_slack[j] = slack
+                        way[j] = column
+                    if min_slack[j] < delta:
+                        delta = min_slack[j]
+                        next_column = j
+            for j in range(n + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_slack[j] -= delta
+            column = next_column
+        # Flip the augmenting path
+        while column != 0:
+            previous_column = way[column]
+            match[column] = match[previous_column]
+            column = previous_column
+
+    return sum(cost_matrix[match[j] - 1][j - 1] for j in range(1, n + 1))
+
+class MatchingHeuristic:
+    """
+    Lower bound on the cost of pushing every stone onto a switch.
+
+    Each stone is matched to its own switch with a minimum-cost assignment, where moving
+    stone i onto switch j costs push_distance * (1 + weight_i), the cost of that many
+    pushes. Push distances come from a precomputed PushDistanceTable. Results are cached
+    per stone configuration since Ares moves far more often than the stones do; pass
+    max_cache_entries to bound the cache for memory-limited searches.
+    """
+
+    # Stands in for an unreachable switch; large enough that no real assignment uses it
+    UNREACHABLE_COST = 10 ** 9
+
+    def __init__(self, push_distances, stone_weights, max_cache_entries=None):
+        self.push_distances = push_distances
+        self.stone_weights = stone_weights
+        self.max_cache_entries = max_cache_entries
+        self.cache = {}
+
+    def estimate(self, stone_positions):
+        if stone_positions in self.cache:
+            return self.cache[stone_positions]
+
+        tables = self.push_distances.tables
+        if len(stone_positions) > len(tables):
+            return INFINITY  # Not enough switches to ever put every stone on one
+
+        cost_matrix = []
+        for stone, weight in zip(stone_positions, self.stone_weights):
+            push_cost = 1 + weight
+            cell = self.push_distances.index(stone)
+            row = []
+            for table in tables:
+                distance = table[cell]
+                row.append(self.UNREACHABLE_COST if distance == UNREACHABLE else distance * push_cost)
+            cost_matrix.append(row)
+
+        # Extra switches get a dummy stone so the matrix stays square
+        for _ in range(len(tables) - len(cost_matrix)):
+            cost_matrix.append([0] * len(tables))
+
+        cost = min_cost_assignment(cost_matrix) if cost_matrix else 0
+        if cost >= self.UNREACHABLE_COST:
+            cost = INFINITY  # Some stone can't reach any switch left for it
+        if self.max_cache_entries is not None and len(self.cache) >= self.max_cache_entries:
+            self.cache.clear()
+        self.cache[stone_positions] = cost
+        return cost
@@ -0,0 +1,167 @@
+import time
+from array import array
+from model.result import Result
+from model.memory import MemoryTracker
+from search_algorithm.a_star import A_star
+from search_algorithm.budget import final_status
+from search_algorithm.heuristic import MatchingHeuristic
+
+INFINITY = float('inf')
+
+class TranspositionTable:
+    """
+    Fixed-capacity transposition table for IDA*.
+
+    Entries live in flat arrays indexed by hash % capacity, so memory is allocated once
+    and never grows. Each slot keeps the state's hash, the smallest g it was reached with
+    and the iteration that stored it. A new entry replaces the slot's occupant if the slot
+    is empty, was written in an earlier iteration, or holds a deeper (larger g) entry:
+    shallow entries cut off the most work when they are hit again.
+    """
+
+    ENTRY_BYTES = 8 + 4 + 4  # hash, g, iteration
+
+    def __init__(self, size_mb=16):
+        self.capacity = max(1, int(size_mb * 1024 * 1024) // self.ENTRY_BYTES)
+        self.hashes = array('Q', [0]) * self.capacity
+        self.costs = array('I', [0]) * self.capacity
+        self.iterations = array('I', [0]) * self.capacity  # 0 = empty slot
+
+    def was_reached(self, state_hash, g, iteration):
+        """Check if this iteration already reached the state with a cost of at most g."""
+        slot = state_hash % self.capacity
+        return (self.iterations[slot] == iteration and self.hashes[slot] == state_hash
+                and self.costs[slot] <= g)
+
+    def store(self, state_hash, g, iteration):
+        slot = state_hash % self.capacity
+        if self.iterations[slot] == iteration and self.costs[slot] < g:
+            return  # Keep the shallower entry
+        self.hashes[slot] = state_hash
+        self.costs[slot] = g
+        self.iterations[slot] = iteration
+
+class IDA_star(A_star):
+    """
+    Iterative deepening A*: depth-first searches bounded by f = g + h, raising the
+    bound to the smallest f that exceeded it until a solution is found.
+
+    Only the current path and a fixed-size transposition table are kept, so peak memory
+    is set by table_size_mb instead of by the number of states explored. Level parsing,
+    move generation, deadlock pruning and the heuristic are shared with A_star.
+    """
+
+    def __init__(self, input_file="", push_level=False, corral_pruning=False, table_size_mb=16, budget=None):
+        super().__init__(input_file, push_level=push_level, corral_pruning=corral_pruning, budget=budget)
+        self.result = Result(search_algo_name = "IDA*")
+        self.table_size_mb = table_size_mb
+        # The heuristic cache would otherwise grow with the search space
+        self.matching = MatchingHeuristic(self.push_distances, self.start_state['stone_weights'], max_cache_entries=4096)
+
+    def run(self):
+        if self.start_state == -1:
+            return
+        start_time = time.time()
+
+        # Initialize memory tracker
+        memory_tracker = MemoryTracker()
+        self.budget.start(stats=lambda: (None, bound))  # sampled for progress reports
+        self.stop_reason = None
+
+        transposition_table = TranspositionTable(self.table_size_mb)
+        start_state = (self.start_state['ares'], tuple(self.start_state['stones']))
+        start_hash = self.zobrist.hash_state(start_state)
+        start_on_switch = self.count_on_switch(start_state)
+        nodes_generated = 0
+
+        path = None
+        bound = self.heuristic(start_state)
+        iteration = 0
+        while path is None and bound < INFINITY and self.stop_reason is None:
+            iteration += 1
+            path, bound, nodes = self.search(start_state, start_hash, start_on_switch, bound, iteration, transposition_table, nodes_generated)
+            nodes_generated += nodes
+
+        if path is not None:
+            self.result.set_sequence_of_actions(path)
+            self.result.set_steps(len(path))
+            self.result.set_cost_steps(self.find_cost_each_step(path))
+            total_cost = self.result.get_cost_steps()[-1]
+            self.result.set_total_cost(total_cost)
+
+        end_time = time.time()
+
+        self.result.set_time((end_time - start_time) * 1000)
+        self.result.set_memory(memory_tracker.peak_memory_usage())
+        self.result.set_memory_mode(memory_tracker.mode)
+        self.result.set_status(final_status(self.result, self.stop_reason))
+        self.result.set_node(nodes_generated)
+
+        # Stop memory tracking
+        memory_tracker.stop_tracking()
+
+    def search(self, start_state, start_hash, start_on_switch, bound, iteration, transposition_table, nodes_before=0):
+        """
+        One bounded depth-first pass, done with an explicit stack since solution paths
+        can be far deeper than Python's recursion limit.
+
+        Returns (path, next_bound, nodes_expanded); path is None if no goal is within
+        the bound, and next_bound is the smallest f that went over it. If the budget
+        runs out the pass stops early and self.stop_reason is set.
+        """
+        goal_count = len(self.start_state['stones'])
+        next_bound = INFINITY
+        nodes_expanded = 0
+
+        if start_on_switch == goal_count:
+            return self.build_path([]), bound, 1
+
+        transposition_table.store(start_hash, 0, iteration)
+        stack = [iter(self.get_ordered_children(start_state, start_hash, start_on_switch, 0))]
+        nodes_expanded += 1
+        actions = []
+
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                # All children explored: backtrack
+                stack.pop()
+                if actions:
+                    actions.pop()
+                continue
+
+            f, g, state, action, state_hash, on_switch = child
+            if f > bound:
+                next_bound = min(next_bound, f)
+                continue
+            if on_switch == goal_count:
+                return self.build_path(actions + [action]), bound, nodes_expanded
+            if transposition_table.was_reached(state_hash, g, iteration):
+                continue
+            transposition_table.store(state_hash, g, iteration)
+
+            nodes_expanded += 1
+            self.stop_reason = self.budget.check(nodes_before + nodes_expanded)
+            if self.stop_reason is not None:
+                return None, next_bound, nodes_expanded
+            stack.append(iter(self.get_ordered_children(state, state_hash, on_switch, g)))
+            actions.append(action)
+
+        return None, next_bound, nodes_expanded
+
+    def get_ordered_children(self, state, state_hash, on_switch, g):
+        """Successors as (f, g, state, action, hash, on_switch), most promising first."""
+        children = []
+        for neighbor_state, action, action_cost, neighbor_hash, neighbor_on_switch in self.get_neighbors(state, state_hash, on_switch):
+            new_cost = g + action_cost
+            priority = new_cost + self.heuristic(neighbor_state)
+            children.append((priority, new_cost, neighbor_state, action, neighbor_hash, neighbor_on_switch))
+        children.sort(key=lambda child: child[0])
+        return children
+
+    def build_path(self, actions):
+        if self.push_level:
+            # Each action is a single (push, stone_position); fill in the walks between them
+            start_state = (self.start_state['ares'], self.start_state['stones'])
+            return self.push_search.expand_path(start_state, actions)
+        return ''.join(actions)
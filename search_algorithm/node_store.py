@@ -0,0 +1,77 @@
+from array import array
+
+ACTIONS = 'uldrULDR'
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+NO_PARENT = 0xFFFFFFFF
+
+class NodeStore:
+    """
+    A solver's search tree in flat arrays instead of a dict of (parent, action) tuples.
+
+    Every state is interned by its key (a Zobrist hash or packed state) into a dense
+    id, `index[key]`. For each id:
+    - parents[id]: the parent's id, NO_PARENT for a root (array('I'))
+    - actions[id]: the move leading to it, as its index in 'uldrULDR' (array('b'))
+    - stones[id]: at push level, where an action is a (push, stone_position) pair, the
+      pushed stone's cell index in the StateCodec (array('I'))
+    So a node costs its dict entry plus 5 or 9 bytes, with no tuples kept alive.
+    Pass the codec for push-level actions.
+
+    The index doubles as the visited set (`key in nodes`), and set() overwrites the
+    parent of a known state, for solvers that find cheaper paths later.
+    """
+
+    def __init__(self, codec=None):
+        self.index = {}
+        self.parents = array('I')
+        self.actions = array('b')
+        self.codec = codec
+        self.stones = array('I') if codec is not None else None
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def add_root(self, key):
+        self.set(key, None, None)
+
+    def set(self, key, parent_key, action):
+        """Record that key is reached from parent_key by action (parent_key None for a root)."""
+        parent = NO_PARENT if parent_key is None else self.index[parent_key]
+        stone = 0
+        if action is None:
+            code = -1
+        elif self.codec is not None:
+            push, stone_position = action
+            code = ACTION_CODES[push]
+            stone = self.codec.cell_index[stone_position]
+        else:
+            code = ACTION_CODES[action]
+
+        node = self.index.get(key)
+        if node is None:
+            self.index[key] = len(self.parents)
+            self.parents.append(parent)
+            self.actions.append(code)
+            if self.stones is not None:
+                self.stones.append(stone)
+        else:
+            self.parents[node] = parent
+            self.actions[node] = code
+            if self.stones is not None:
+                self.stones[node] = stone
+
+    def path(self, key):
+        """Actions from the root to key, in the form they were given to set()."""
+        path = []
+        node = self.index[key]
+        while self.parents[node] != NO_PARENT:
+            action = ACTIONS[self.actions[node]]
+            if self.stones is not None:
+                action = (action, self.codec.cells[self.stones[node]])
+            path.append(action)
+            node = self.parents[node]
+        path.reverse()
+        return path
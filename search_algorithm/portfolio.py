@@ -0,0 +1,116 @@
+import time
+import queue
+import multiprocessing
+from model.result import Result
+from search_algorithm.a_star import A_star
+from search_algorithm.ara_star import ARA_star
+from search_algorithm.ucs_new import UCS
+from search_algorithm.budget import SearchBudget, BUDGET_EXCEEDED, final_status
+
+# (solver class, keyword arguments) pairs raced by default. All of them return the
+# cheapest solution, so in mode="first" the winner is as good as any and can be
+# cached and saved as final; a faster but suboptimal solver (e.g. Bidirectional)
+# would win most races with a costlier solution
+DEFAULT_CONFIGURATIONS = (
+    (A_star, {'push_level': True}),
+    (A_star, {'push_level': False}),
+    (ARA_star, {'push_level': True}),
+    (UCS, {'push_level': True}),
+)
+
+def run_configuration(algorithm_class, input_file, options):
+    """Solve one level with one configuration; runs inside a worker process."""
+    solver = algorithm_class(input_file, **options)
+    solver.run()
+    return solver.get_result()
+
+def is_solved(result):
+    # Unsolved results never get their cost steps set; a solved level has at least [0]
+    return bool(result.get_cost_steps())
+
+class Portfolio:
+    """
+    Races several solver configurations on the same level, one process each.
+
+    Each configuration is a (solver class, keyword arguments) pair run in a process
+    pool, so the solvers use separate cores instead of sharing one under the GIL. With
+    mode="first" the first configuration to solve the level wins; with mode="best" the
+    cheapest solution found before the deadline (seconds) wins. Either way the remaining
+    workers are terminated as soon as the winner is known. In mode="first" the result
+    is only as cheap as the winner guarantees, which is why the default configurations
+    are all cost-optimal.
+
+    The returned Result is the winner's, renamed to "Portfolio" (so results stores keep
+    one entry per level however the race went), with the winning solver's name in
+    solved_by and the wall-clock time of the whole race. The budget's cancellation,
+    time and memory limits are checked while waiting, and stop the race like the
+    deadline does.
+    """
+
+    def __init__(self, input_file="", push_level=False, configurations=None, mode="first", deadline=None, processes=None, budget=None):
+        # Each configuration picks its own search level; push_level is accepted so the
+        # portfolio can be built like the other solvers
+        if mode not in ("first", "best"):
+            raise ValueError("mode must be 'first' or 'best'.")
+        self.input_file = input_file
+        self.configurations = tuple(configurations) if configurations is not None else DEFAULT_CONFIGURATIONS
+        self.mode = mode
+        self.deadline = deadline
+        self.processes = processes or len(self.configurations)
+        self.budget = budget or SearchBudget()
+        self.result = Result(search_algo_name = "Portfolio")
+
+    def get_result(self):
+        return self.result
+
+    def run(self):
+        start_time = time.time()
+        end_time = start_time + self.deadline if self.deadline is not None else None
+        self.budget.start(stats=lambda: (None, best.get_total_cost() if best is not None else None),  # bound: best cost so far
+                          with_children=True)
+        stop_reason = None
+
+        # Spawned workers don't inherit the parent's threads (e.g. the GUI's QThread)
+        context = multiprocessing.get_context("spawn")
+        finished = queue.Queue()
+        best = None
+
+        pool = context.Pool(self.processes)
+        try:
+            for algorithm_class, options in self.configurations:
+                pool.apply_async(run_configuration, (algorithm_class, self.input_file, options),
+                                 callback=finished.put, error_callback=finished.put)
+
+            remaining = len(self.configurations)
+            while remaining and stop_reason is None:
+                if end_time is not None and time.time() >= end_time:
+                    stop_reason = BUDGET_EXCEEDED  # Deadline reached
+                    break
+                try:
+                    result = finished.get(timeout=0.05)
+                except queue.Empty:
+                    stop_reason = self.budget.poll(None)  # Nodes are counted by the workers, out of reach here
+                    continue
+                remaining -= 1
+                if isinstance(result, BaseException):
+                    print(f"Portfolio configuration failed: {result!r}")
+                    continue
+                if not is_solved(result):
+                    continue
+                if best is None or result.get_total_cost() < best.get_total_cost():
+                    best = result
+                if self.mode == "first":
+                    break
+        finally:
+            pool.terminate()  # Cancel every configuration still running
+            pool.join()
+
+        if best is not None:
+            print(f"Portfolio won by {best.get_search_algo_name()}")
+            best.set_solved_by(best.get_search_algo_name())
+            best.set_search_algo_name("Portfolio")
+            best.set_time((time.time() - start_time) * 1000)
+            self.result = best
+        else:
+            self.result.set_time((time.time() - start_time) * 1000)
+        self.result.set_status(final_status(self.result, stop_reason))
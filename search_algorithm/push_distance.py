@@ -0,0 +1,67 @@
+from array import array
+from collections import deque
+from model.level import uses_level_grid
+
+DIRECTIONS = ((0, -1), (-1, 0), (0, 1), (1, 0))
+UNREACHABLE = 0xFFFF  # Largest value an array('H') can hold
+
+class PushDistanceTable:
+    """
+    Precomputed minimal push counts from every cell to every switch.
+
+    For each switch a reverse-push BFS pulls a lone stone backwards from the switch:
+    pulling it from (x, y) to (x + dx, y + dy) needs both that cell and the one behind
+    it (where Ares steps back to) to be floor. Walls are respected and other stones are
+    ignored, so every entry is a lower bound on the real number of pushes. On large
+    levels the BFS runs layer by layer on NumPy masks, for all switches at once
+    (LevelGrid.pull_distances_each); small ones run it cell by cell.
+
+    Each switch gets a flat array('H') indexed by y * width + x, holding UNREACHABLE
+    for cells a stone can't be pushed from onto that switch. Lookups during search are
+    a single index.
+    """
+
+    def __init__(self, maze, switches):
+        self.maze = maze
+        self.switches = switches
+        self.width = max(len(row) for row in maze)
+        self.size = self.width * len(maze)
+
+        if uses_level_grid(maze):
+            from model.grid import LevelGrid  # Imports NumPy
+            distances = LevelGrid(maze).pull_distances_each([[switch] for switch in switches])
+            self.tables = [self.to_array(table) for table in distances]
+        else:
+            self.tables = [self.build_table(switch) for switch in switches]
+
+    def to_array(self, distances):
+        table = array('H')
+        table.frombytes(distances.tobytes())
+        return table
+
+    def is_floor(self, x, y):
+        maze = self.maze
+        return 0 <= y < len(maze) and 0 <= x < len(maze[y]) and maze[y][x] != '#'
+
+    def build_table(self, switch):
+        """Reverse-push BFS from one switch."""
+        width = self.width
+        table = array('H', [UNREACHABLE]) * self.size
+        table[switch[1] * width + switch[0]] = 0
+
+        queue = deque([switch])
+        while queue:
+            x, y = queue.popleft()
+            distance = table[y * width + x] + 1
+            for dx, dy in DIRECTIONS:
+                stone_x, stone_y = x + dx, y + dy
+                if not self.is_floor(stone_x, stone_y) or table[stone_y * width + stone_x] != UNREACHABLE:
+                    continue
+                if self.is_floor(x + 2 * dx, y + 2 * dy):
+                    table[stone_y * width + stone_x] = distance
+                    queue.append((stone_x, stone_y))
+        return table
+
+    def index(self, position):
+        """Flat index of a cell, shared by all tables."""
+        return position[1] * self.width + position[0]
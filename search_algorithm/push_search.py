@@ -0,0 +1,108 @@
+from collections import deque
+from search_algorithm.bitboard import Bitboard
+
+DIRECTIONS = {'u': (0, -1), 'l': (-1, 0), 'd': (0, 1), 'r': (1, 0)}
+
+class PushSearch:
+    """
+    Push-level (macro move) expansion shared by the solvers.
+
+    Instead of one node per Ares step, a node is a stone configuration plus the
+    cell Ares stands on, and its successors are the pushes Ares can walk to.
+    The walk between two pushes is found with a flood fill and only expanded
+    back into 'uldr' moves when the final path is reconstructed. Adjacency comes
+    from the level's precomputed CellGraph; when only Ares' region is needed, not
+    the walking distances, it is flood filled on a Bitboard instead.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.board = Bitboard(graph.cells)
+
+    def reachable(self, ares_position, stones_set):
+        """Flood fill from Ares, returning {cell: walking distance} for every reachable cell."""
+        moves = self.graph.moves
+        distances = {ares_position: 0}
+        queue = deque([ares_position])
+        while queue:
+            position = queue.popleft()
+            distance = distances[position] + 1
+            for _, next_position, _ in moves[position]:  # Walls are already left out
+                if next_position in distances or next_position in stones_set:
+                    continue
+                distances[next_position] = distance
+                queue.append(next_position)
+        return distances
+
+    def region(self, ares_position, stone_positions):
+        """Bitboard of the cells Ares can walk to."""
+        return self.board.reachable(ares_position, self.board.occupancy(stone_positions))
+
+    def normalize(self, ares_position, stone_positions):
+        """Canonical Ares cell: the smallest cell (row-major) of the region Ares can walk to."""
+        return self.board.min_cell(self.region(ares_position, stone_positions))
+
+    def get_pushes(self, state, distances=None):
+        """
+        List every push Ares can walk to from this state.
+
+        Returns (stone_index, action, new_stone_position, walk_distance) tuples; after the
+        push Ares stands on the stone's old cell. Pushes into walls are left out, but
+        other stones in front of the stone are not checked here, so the caller still
+        validates the new stone position. walk_distance is only known if the caller
+        passes the state's distances (from reachable()); otherwise Ares' region is
+        found on the bitboard and walk_distance is None.
+        """
+        ares_position, stone_positions = state
+        graph_pushes = self.graph.pushes
+        pushes = []
+
+        if distances is None:
+            bits = self.board.bits
+            region = self.region(ares_position, stone_positions)
+            for stone_index, stone in enumerate(stone_positions):
+                for action, push_from, new_stone_position in graph_pushes[stone]:
+                    if bits[push_from] & region:
+                        pushes.append((stone_index, action, new_stone_position, None))
+            return pushes
+
+        for stone_index, stone in enumerate(stone_positions):
+            for action, push_from, new_stone_position in graph_pushes[stone]:
+                if push_from in distances:
+                    pushes.append((stone_index, action, new_stone_position, distances[push_from]))
+        return pushes
+
+    def walk_path(self, distances, target):
+        """Walk back from target along decreasing distances and return the 'uldr' moves leading to it."""
+        path = []
+        position = target
+        while distances[position] > 0:
+            for action, (dx, dy) in DIRECTIONS.items():
+                previous_position = (position[0] - dx, position[1] - dy)
+                if distances.get(previous_position) == distances[position] - 1:
+                    path.append(action)
+                    position = previous_position
+                    break
+        return ''.join(reversed(path))
+
+    def expand_path(self, start_state, pushes):
+        """
+        Turn a chain of pushes into the full action string.
+
+        start_state is the real starting (ares_position, stone_positions); pushes is a list
+        of (action, stone_position) pairs telling which stone was pushed in which direction.
+        """
+        ares_position, stone_positions = start_state
+        stone_positions = list(stone_positions)
+        path = []
+        for push, stone_position in pushes:
+            dx, dy = DIRECTIONS[push.lower()]
+            push_from = (stone_position[0] - dx, stone_position[1] - dy)
+
+            distances = self.reachable(ares_position, set(stone_positions))
+            path.append(self.walk_path(distances, push_from))
+            path.append(push)
+
+            stone_positions[stone_positions.index(stone_position)] = (stone_position[0] + dx, stone_position[1] + dy)
+            ares_position = stone_position
+        return ''.join(path)
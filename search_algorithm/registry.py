@@ -0,0 +1,22 @@
+import importlib
+
+# Solver name -> (module, class). Modules are only imported when a solver is loaded,
+# so listing the names stays cheap for command-line tools.
+ALGORITHMS = {
+    "BFS": ("search_algorithm.bfs", "BFS"),
+    "DFS": ("search_algorithm.dfs_3", "DFS"),
+    "UCS": ("search_algorithm.ucs_new", "UCS"),
+    "A*": ("search_algorithm.a_star", "A_star"),
+    "IDA*": ("search_algorithm.ida_star", "IDA_star"),
+    "ARA*": ("search_algorithm.ara_star", "ARA_star"),
+    "HDA*": ("search_algorithm.hda_star", "HDA_star"),
+    "Bidirectional": ("search_algorithm.bidirectional", "Bidirectional"),
+    "Portfolio": ("search_algorithm.portfolio", "Portfolio"),
+}
+
+def load_algorithm(name):
+    """Import and return the solver class registered under name."""
+    if name not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {name}")
+    module_name, class_name = ALGORITHMS[name]
+    return getattr(importlib.import_module(module_name), class_name)
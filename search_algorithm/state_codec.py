@@ -0,0 +1,69 @@
+from model.level import uses_level_grid
+
+class StateCodec:
+    """
+    Packs a search state (ares_position, stone_positions) into a single int.
+
+    Every floor cell Ares or a stone can ever occupy gets a dense index, and the
+    state is stored as fixed-width fields of `bits` bits each:
+
+        key = ares | stone_0 << bits | stone_1 << 2 * bits | ...
+
+    The order of the stones is kept, so solvers that care about stone identity
+    (weights) can decode the exact tuple they encoded.
+    """
+
+    def __init__(self, maze, ares_position, stone_positions):
+        # Only floor cells connected to Ares or a stone can ever be occupied, so only
+        # they get an index, in row-major order
+        if uses_level_grid(maze):
+            from model.grid import LevelGrid  # Imports NumPy
+            ys, xs = LevelGrid(maze).reachable_mask([ares_position, *stone_positions]).nonzero()
+            self.cells = list(zip(xs.tolist(), ys.tolist()))  # index -> (x, y)
+        else:
+            self.cells = sorted(self.flood_fill(maze, [ares_position, *stone_positions]), key=lambda cell: (cell[1], cell[0]))
+        self.cell_index = {cell: index for index, cell in enumerate(self.cells)}
+        self.stone_count = len(stone_positions)
+
+        self.bits = max(1, (len(self.cells) - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+
+    def flood_fill(self, maze, starts):
+        """Non-wall cells connected to any of the start cells."""
+        height = len(maze)
+        reached = set()
+        stack = list(starts)
+        while stack:
+            position = stack.pop()
+            if position in reached:
+                continue
+            x, y = position
+            if not (0 <= y < height and 0 <= x < len(maze[y])) or maze[y][x] == '#':
+                continue
+            reached.add(position)
+            stack.extend(((x, y - 1), (x - 1, y), (x, y + 1), (x + 1, y)))
+        return reached
+
+    def encode(self, state):
+        """Pack an (ares_position, stone_positions) state into an int."""
+        ares_position, stone_positions = state
+        cell_index = self.cell_index
+        bits = self.bits
+
+        key = 0
+        for stone in reversed(stone_positions):
+            key = (key << bits) | cell_index[stone]
+        return (key << bits) | cell_index[ares_position]
+
+    def decode(self, key):
+        """Unpack an int produced by encode() back into an (ares_position, stone_positions) state."""
+        cells = self.cells
+        bits = self.bits
+        mask = self.mask
+
+        ares_position = cells[key & mask]
+        stone_positions = []
+        for _ in range(self.stone_count):
+            key >>= bits
+            stone_positions.append(cells[key & mask])
+        return ares_position, tuple(stone_positions)
@@ -172,6 +172,7 @@ class UCS:
 
         self.result.set_time((end_time - start_time) * 1000)  # Convert to milliseconds
         self.result.set_memory(memory_tracker.peak_memory_usage())  # Convert to MB
+        self.result.set_memory_mode(memory_tracker.mode)
 
         memory_tracker.stop_tracking()
 
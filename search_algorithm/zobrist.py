@@ -0,0 +1,33 @@
+import random
+
+class ZobristHasher:
+    """
+    Zobrist hashing of (ares_position, stone_positions) states.
+
+    Every cell gets a random 64-bit key for Ares and one for a stone; a state's hash is
+    the XOR of the keys of the cells it occupies. A move only changes a couple of cells,
+    so the hash of a successor is the parent's hash with those keys XORed out and in,
+    which is O(1) instead of rehashing the whole state tuple.
+
+    With ordered_stones=False every stone shares the same keys, so the hash doesn't
+    depend on stone order and states don't need sorting to be canonical. With
+    ordered_stones=True each stone index gets its own keys, for solvers where stone
+    identity (weight) matters. Both are reachable as stone_keys[stone_index][cell].
+    """
+
+    def __init__(self, cells, stone_count, ordered_stones=True, seed=0):
+        rng = random.Random(seed)  # Fixed seed, so runs are reproducible
+        self.ares_keys = {cell: rng.getrandbits(64) for cell in cells}
+        if ordered_stones:
+            self.stone_keys = [{cell: rng.getrandbits(64) for cell in cells} for _ in range(stone_count)]
+        else:
+            shared_keys = {cell: rng.getrandbits(64) for cell in cells}
+            self.stone_keys = [shared_keys] * stone_count
+
+    def hash_state(self, state):
+        """Full hash of a state; successors should be hashed incrementally instead."""
+        ares_position, stone_positions = state
+        state_hash = self.ares_keys[ares_position]
+        for stone_index, stone in enumerate(stone_positions):
+            state_hash ^= self.stone_keys[stone_index][stone]
+        return state_hash
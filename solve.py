@@ -0,0 +1,97 @@
+"""
+Headless solver entry point.
+
+    python solve.py inputs/input-01.txt -a "A*" --push-level
+    python solve.py - < inputs/input-01.txt
+
+Only the search core is imported (no PyQt6, GUI or controller), and the solver module
+itself is imported only once the algorithm is known, so a short solve is dominated by
+the search rather than by interpreter start-up. Solutions are kept in the on-disk
+SolutionCache, so repeating a solve is a lookup (--no-cache skips it). The result is
+printed in the same three-line format as the files in outputs/; solver progress
+messages, and the status of a search that didn't solve the level, go to stderr.
+--max-nodes, --max-time and --max-memory bound the search, and --progress prints
+progress samples to stderr while it runs.
+"""
+import sys
+import argparse
+import contextlib
+from model.memory import MEMORY_MODES, get_default_mode, set_default_mode
+from search_algorithm.registry import ALGORITHMS, load_algorithm
+
+def solve(level_path, algorithm="A*", push_level=False, use_cache=True, budget=None):
+    """Solve one level file and return the solver's Result (budget: an optional SearchBudget)."""
+    cache = None
+    # Cached results carry the time and memory measured when they were found, so the
+    # memory mode is part of the key
+    options = {'push_level': push_level, 'memory_mode': get_default_mode()}
+    if use_cache:
+        from model.solution_cache import SolutionCache
+        cache = SolutionCache()
+        result = cache.load(level_path, algorithm, options)
+        if result is not None:
+            return result
+
+    algorithm_class = load_algorithm(algorithm)
+    # Keep stdout for the result only
+    with contextlib.redirect_stdout(sys.stderr):
+        solver = algorithm_class(level_path, push_level=push_level, budget=budget)
+        solver.run()
+    result = solver.get_result()
+    if cache is not None:
+        cache.store(level_path, algorithm, options, result)
+    return result
+
+def solve_text(level_text, algorithm="A*", push_level=False, use_cache=True, budget=None):
+    """Solve a level given as the contents of an input file."""
+    import os
+    import tempfile
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write(level_text)
+    try:
+        return solve(f.name, algorithm, push_level, use_cache, budget)
+    finally:
+        os.remove(f.name)
+
+def format_result(result):
+    return (f"{result.get_search_algo_name()}\n"
+            f"Steps: {result.get_steps()}, Cost: {result.get_total_cost()}, Node: {result.get_node()}, "
+            f"Time (ms): {result.get_time()}, Memory (MB): {result.get_memory()}\n"
+            f"{result.get_sequence_of_actions()}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve one level without the GUI.")
+    parser.add_argument("level", nargs="?", default="-", help="level file, or - to read it from stdin (default)")
+    parser.add_argument("-a", "--algorithm", default="A*", choices=list(ALGORITHMS), help="solver to use (default: A*)")
+    parser.add_argument("-p", "--push-level", action="store_true", help="search at push level")
+    parser.add_argument("--memory", choices=MEMORY_MODES, default="off",
+                        help="how to measure memory: off (default, fastest), rss or tracemalloc")
+    parser.add_argument("--no-cache", action="store_true", help="always search, ignoring the on-disk solution cache")
+    parser.add_argument("--max-nodes", type=int, help="stop after expanding this many nodes")
+    parser.add_argument("--max-time", type=float, help="stop after this many seconds")
+    parser.add_argument("--max-memory", type=float, help="stop once the process uses this many MB (RSS)")
+    parser.add_argument("--progress", action="store_true", help="print search progress to stderr every second")
+    args = parser.parse_args(argv)
+    set_default_mode(args.memory)
+
+    from search_algorithm.budget import SearchBudget, SOLVED, STOPPED_EARLY
+    on_progress = (lambda progress: print(progress, file=sys.stderr)) if args.progress else None
+    budget = SearchBudget(max_nodes=args.max_nodes, max_time=args.max_time, max_memory_mb=args.max_memory,
+                          on_progress=on_progress, progress_interval=1.0)
+    if args.level == "-":
+        result = solve_text(sys.stdin.read(), args.algorithm, args.push_level, not args.no_cache, budget)
+    else:
+        result = solve(args.level, args.algorithm, args.push_level, not args.no_cache, budget)
+
+    print(format_result(result))
+    if result.get_from_cache():
+        print("From the solution cache: time and memory are from the run that solved it", file=sys.stderr)
+    if result.get_status() == STOPPED_EARLY:
+        print("Stopped early: a cheaper solution may exist", file=sys.stderr)
+    elif result.get_status() != SOLVED:
+        print(f"Not solved: {result.get_status()}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
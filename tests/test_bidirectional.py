@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_algorithm.bidirectional import Bidirectional
+from search_algorithm.budget import SOLVED
+
+# Two stones, three switches; the switch at (2, 5) can't be reached from the start
+SPARE_UNREACHABLE_SWITCH = """7 6
+########
+# .  . #
+# $  $ #
+#    @ #
+###    #
+##.#   #
+########
+"""
+
+# Already solved, with Ares walled off from the stone
+SOLVED_AT_START = """0
+########
+##     #
+# #* # #
+#@#    #
+########
+"""
+
+class BidirectionalTest(unittest.TestCase):
+    def solve(self, level_text):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write(level_text)
+        self.addCleanup(os.remove, f.name)
+        solver = Bidirectional(f.name)
+        solver.run()
+        return solver.get_result()
+
+    def test_spare_switch_outside_reachable_cells(self):
+        result = self.solve(SPARE_UNREACHABLE_SWITCH)
+        self.assertEqual(result.get_status(), SOLVED)
+        self.assertEqual(result.get_total_cost(), 19)
+
+    def test_solved_start_with_ares_away_from_stones(self):
+        result = self.solve(SOLVED_AT_START)
+        self.assertEqual(result.get_status(), SOLVED)
+        self.assertEqual(result.get_total_cost(), 0)
+        self.assertEqual(result.get_sequence_of_actions(), "")
+
+if __name__ == "__main__":
+    unittest.main()